@@ -52,6 +52,7 @@ def eval_models_component(
     """
     import os
     import json
+    from concurrent.futures import ThreadPoolExecutor
     
     # Set environment variables for container execution
     os.environ["USE_KFP"] = "1"
@@ -61,7 +62,10 @@ def eval_models_component(
     os.environ["MLFLOW_S3_ENDPOINT_URL"] = mlflow_s3_endpoint
     os.environ["GATEWAY_URL"] = gateway_url
     os.environ["PROMOTION_BUCKET"] = promotion_bucket
-    os.environ["SCORE_WEIGHTS"] = json.dumps({"rmse": rmse_weight, "mae": mae_weight, "mse": mse_weight})
+    os.environ["SCORE_WEIGHTS"] = json.dumps(
+        {"rmse": float(rmse_weight), "mae": float(mae_weight), "mse": float(mse_weight)},
+        separators=(',', ':'),
+    )
     os.environ["KFP_GRU_MODEL_INPUT_PATH"] = gru_model.path
     os.environ["KFP_LSTM_MODEL_INPUT_PATH"] = lstm_model.path
     os.environ["KFP_PROPHET_MODEL_INPUT_PATH"] = prophet_model.path
@@ -75,12 +79,18 @@ def eval_models_component(
     # which reads KFP_* environment variables and writes outputs
     from eval_container import main
     
-    # Read outputs written by container
-    with open(promotion_pointer.path, 'r') as f:
-        pointer_data = json.load(f)
+    # Read outputs written by container. The two files are independent, so
+    # read them concurrently to overlap round trips on object-store-backed mounts
+    def _load_json(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pointer_future = pool.submit(_load_json, promotion_pointer.path)
+        metadata_future = pool.submit(_load_json, eval_metadata.path)
+        pointer_data = pointer_future.result()
+        metadata = metadata_future.result()
+    
     promotion_pointer.uri = pointer_data['uri']
     promotion_pointer.metadata.update(pointer_data['metadata'])
-    
-    with open(eval_metadata.path, 'r') as f:
-        metadata = json.load(f)
     eval_metadata.metadata.update(metadata)
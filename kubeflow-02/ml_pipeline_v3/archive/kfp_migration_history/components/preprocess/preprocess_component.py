@@ -1,7 +1,8 @@
 """Kubeflow Pipelines v2 component for FLTS preprocessing.
 
-This module provides a Python-based component wrapper that loads the
-container-based component definition from component.yaml.
+This module defines the preprocess step as a KFP v2 container component that
+runs the flts-preprocess image entrypoint directly. The equivalent pure-YAML
+definition in component.yaml remains loadable via load_component_from_yaml().
 
 Usage:
     from kubeflow_pipeline.components.preprocess.preprocess_component import preprocess_component
@@ -14,9 +15,8 @@ Usage:
             sample_train_rows=50
         )
 """
-from typing import NamedTuple
 from kfp import dsl
-from kfp.dsl import component, Dataset, Input, Output
+from kfp.dsl import Dataset, Output
 import os
 
 
@@ -24,15 +24,14 @@ import os
 _COMPONENT_YAML_PATH = os.path.join(os.path.dirname(__file__), 'component.yaml')
 
 
-@component(
-    base_image='flts-preprocess:latest',
-    packages_to_install=[]  # All dependencies in base image
-)
+@dsl.container_component
 def preprocess_component(
     dataset_name: str,
     identifier: str,
     training_data: Output[Dataset],
     inference_data: Output[Dataset],
+    config_hash: dsl.OutputPath(str),
+    config_json: dsl.OutputPath(str),
     sample_train_rows: int = 0,
     sample_test_rows: int = 0,
     sample_strategy: str = 'head',
@@ -55,14 +54,18 @@ def preprocess_component(
 ):
     """Preprocess raw time-series data into training and inference datasets.
     
-    This component wraps the existing preprocess_container with USE_KFP=1 flag,
-    replacing Kafka producer calls with KFP artifact writes.
+    Runs the image's own entrypoint (python main.py) with USE_KFP=1, so the
+    preprocessing modules are imported once by the container process instead
+    of inside a lightweight-component wrapper. Parameters are handed over as
+    environment variables via `env`, which is how main.py reads its config.
     
     Args:
         dataset_name: Name of the dataset (e.g., 'PobleSec')
         identifier: Run identifier for lineage tracking
         training_data: Output dataset artifact (training Parquet)
         inference_data: Output dataset artifact (test Parquet)
+        config_hash: Output SHA256 hash of the preprocessing config
+        config_json: Output canonical preprocessing config JSON
         sample_train_rows: Number of training rows to sample (0=all)
         sample_test_rows: Number of test rows to sample (0=all)
         sample_strategy: Sampling strategy ('head' or 'random')
@@ -82,64 +85,42 @@ def preprocess_component(
         gateway_url: MinIO gateway URL
         input_bucket: Input bucket for raw CSV files
         output_bucket: Output bucket for Parquet files
-    
-    Returns:
-        Tuple of (config_hash: str, config_json: str)
     """
-    import os
-    import json
-    import subprocess
-    from collections import namedtuple
-    
-    # Set environment variables for the container
-    env = os.environ.copy()
-    env.update({
-        'USE_KFP': '1',
-        'DATASET_NAME': dataset_name,
-        'IDENTIFIER': identifier,
-        'SAMPLE_TRAIN_ROWS': str(sample_train_rows),
-        'SAMPLE_TEST_ROWS': str(sample_test_rows),
-        'SAMPLE_STRATEGY': sample_strategy,
-        'SAMPLE_SEED': str(sample_seed),
-        'FORCE_REPROCESS': str(force_reprocess),
-        'EXTRA_HASH_SALT': extra_hash_salt,
-        'HANDLE_NANS': str(handle_nans).lower(),
-        'NANS_THRESHOLD': str(nans_threshold),
-        'NANS_KNN': str(nans_knn),
-        'CLIP_ENABLE': str(clip_enable).lower(),
-        'CLIP_METHOD': clip_method,
-        'CLIP_FACTOR': str(clip_factor),
-        'TIME_FEATURES_ENABLE': str(time_features_enable).lower(),
-        'LAGS_ENABLE': str(lags_enable).lower(),
-        'LAGS_N': str(lags_n),
-        'SCALER': scaler,
-        'GATEWAY_URL': gateway_url,
-        'INPUT_BUCKET': input_bucket,
-        'OUTPUT_BUCKET': output_bucket,
-        'KFP_TRAINING_DATA_OUTPUT_PATH': training_data.path,
-        'KFP_INFERENCE_DATA_OUTPUT_PATH': inference_data.path,
-        'KFP_CONFIG_HASH_OUTPUT_PATH': '/tmp/config_hash.txt',
-        'KFP_CONFIG_JSON_OUTPUT_PATH': '/tmp/config_json.txt'
-    })
-    
-    # Run the preprocessing logic (import from existing module)
-    # Note: In actual execution, this runs inside the container
-    from preprocess_container.main import run_preprocess
-    run_preprocess()
-    
-    # Read outputs
-    with open('/tmp/config_hash.txt', 'r') as f:
-        config_hash = f.read().strip()
-    
-    with open('/tmp/config_json.txt', 'r') as f:
-        config_json = f.read().strip()
-    
-    # KFP will automatically populate training_data and inference_data artifacts
-    # from the paths written by _write_kfp_artifacts()
-    
-    PreprocessOutputs = namedtuple('PreprocessOutputs', ['config_hash', 'config_json'])
+    # Every parameter maps to its upper-cased env var name; build the
+    # assignments in one pass instead of a hand-maintained list
+    params = {
+        'dataset_name': dataset_name,
+        'identifier': identifier,
+        'sample_train_rows': sample_train_rows,
+        'sample_test_rows': sample_test_rows,
+        'sample_strategy': sample_strategy,
+        'sample_seed': sample_seed,
+        'force_reprocess': force_reprocess,
+        'extra_hash_salt': extra_hash_salt,
+        'handle_nans': handle_nans,
+        'nans_threshold': nans_threshold,
+        'nans_knn': nans_knn,
+        'clip_enable': clip_enable,
+        'clip_method': clip_method,
+        'clip_factor': clip_factor,
+        'time_features_enable': time_features_enable,
+        'lags_enable': lags_enable,
+        'lags_n': lags_n,
+        'scaler': scaler,
+        'gateway_url': gateway_url,
+        'input_bucket': input_bucket,
+        'output_bucket': output_bucket,
+        'kfp_training_data_output_path': training_data.path,
+        'kfp_inference_data_output_path': inference_data.path,
+        'kfp_config_hash_output_path': config_hash,
+        'kfp_config_json_output_path': config_json,
+    }
+    env_assignments = [f'{name.upper()}={value}' for name, value in params.items()]
     
-    return PreprocessOutputs(config_hash=config_hash, config_json=config_json)
+    return dsl.ContainerSpec(
+        image='flts-preprocess:latest',
+        command=['env', 'USE_KFP=1', *env_assignments, 'python', 'main.py'],
+    )
 
 
 def load_component_from_yaml():
@@ -3,6 +3,15 @@
 Exports the KFP v2 component for training LSTM time-series forecasting models.
 """
 
-from .train_lstm_component import train_lstm_component
-
 __all__ = ['train_lstm_component']
+
+
+def __getattr__(name):
+    # Lazy export (PEP 562): defer building the KFP component until it is
+    # actually referenced, so importing the package stays cheap. The result is
+    # cached in globals() so it shadows the same-named submodule afterwards.
+    if name == 'train_lstm_component':
+        from .train_lstm_component import train_lstm_component as component
+        globals()[name] = component
+        return component
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
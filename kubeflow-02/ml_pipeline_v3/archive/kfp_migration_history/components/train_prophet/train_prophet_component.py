@@ -53,47 +53,52 @@ def train_prophet_component(
         NamedTuple with model, metrics, and run_id outputs
     """
     import os
-    import json
     from collections import namedtuple
+    from pathlib import Path
+    try:
+        import orjson
+    except ImportError:  # minimal images without orjson
+        import json as orjson
     
     # Set environment variables for container execution
-    os.environ["USE_KFP"] = "1"
-    os.environ["MODEL_TYPE"] = "PROPHET"
-    os.environ["CONFIG_HASH"] = config_hash
-    os.environ["MLFLOW_TRACKING_URI"] = mlflow_tracking_uri
-    os.environ["MLFLOW_S3_ENDPOINT_URL"] = mlflow_s3_endpoint
-    os.environ["GATEWAY_URL"] = gateway_url
-    os.environ["SEASONALITY_MODE"] = seasonality_mode
-    os.environ["CHANGEPOINT_PRIOR_SCALE"] = str(changepoint_prior_scale)
-    os.environ["SEASONALITY_PRIOR_SCALE"] = str(seasonality_prior_scale)
-    os.environ["HOLIDAYS_PRIOR_SCALE"] = str(holidays_prior_scale)
-    os.environ["DAILY_SEASONALITY"] = str(daily_seasonality)
-    os.environ["WEEKLY_SEASONALITY"] = str(weekly_seasonality)
-    os.environ["YEARLY_SEASONALITY"] = str(yearly_seasonality)
-    os.environ["KFP_TRAINING_DATA_INPUT_PATH"] = training_data.path
-    os.environ["KFP_MODEL_OUTPUT_PATH"] = model.path
-    os.environ["KFP_METRICS_OUTPUT_PATH"] = metrics.path
-    os.environ["KFP_RUN_ID_OUTPUT_PATH"] = run_id.path
-    os.environ["AWS_ACCESS_KEY_ID"] = "minio_access_key"
-    os.environ["AWS_SECRET_ACCESS_KEY"] = "minio_secret_key"
+    os.environ.update({
+        "USE_KFP": "1",
+        "MODEL_TYPE": "PROPHET",
+        "CONFIG_HASH": config_hash,
+        "MLFLOW_TRACKING_URI": mlflow_tracking_uri,
+        "MLFLOW_S3_ENDPOINT_URL": mlflow_s3_endpoint,
+        "GATEWAY_URL": gateway_url,
+        "SEASONALITY_MODE": seasonality_mode,
+        "CHANGEPOINT_PRIOR_SCALE": str(changepoint_prior_scale),
+        "SEASONALITY_PRIOR_SCALE": str(seasonality_prior_scale),
+        "HOLIDAYS_PRIOR_SCALE": str(holidays_prior_scale),
+        "DAILY_SEASONALITY": str(daily_seasonality),
+        "WEEKLY_SEASONALITY": str(weekly_seasonality),
+        "YEARLY_SEASONALITY": str(yearly_seasonality),
+        "KFP_TRAINING_DATA_INPUT_PATH": training_data.path,
+        "KFP_MODEL_OUTPUT_PATH": model.path,
+        "KFP_METRICS_OUTPUT_PATH": metrics.path,
+        "KFP_RUN_ID_OUTPUT_PATH": run_id.path,
+        "AWS_ACCESS_KEY_ID": "minio_access_key",
+        "AWS_SECRET_ACCESS_KEY": "minio_secret_key",
+    })
     
     # Import and execute training logic
     # NOTE: The actual training is performed by nonML_container/main.py
-    # which reads KFP_* environment variables and writes outputs
+    # which reads KFP_* environment variables and writes outputs. This import
+    # must stay here: KFP only ships the function body to the container, and
+    # the import runs training, so it has to follow the env setup above.
     from nonML_container import main
     
     # Read outputs written by container
-    with open(model.path, 'r') as f:
-        model_data = json.load(f)
+    model_data = orjson.loads(Path(model.path).read_bytes())
     model.uri = model_data['uri']
     model.metadata.update(model_data['metadata'])
     
-    with open(metrics.path, 'r') as f:
-        metrics_data = json.load(f)
+    metrics_data = orjson.loads(Path(metrics.path).read_bytes())
     metrics.metadata.update(metrics_data)
     
-    with open(run_id.path, 'r') as f:
-        run_id_value = f.read().strip()
+    run_id_value = Path(run_id.path).read_bytes().decode().strip()
     
     # Return as NamedTuple
     ProphetOutputs = namedtuple('ProphetOutputs', ['model', 'metrics', 'run_id'])
@@ -10,10 +10,22 @@ so we define components directly in Python using dsl.ContainerOp.
 Usage:
     python compile_pipeline_v1.py
 """
+import hashlib
+import inspect
+import os
+import shutil
 import sys
-from pathlib import Path
+import kfp
 from kfp import dsl
 from kfp.compiler import Compiler
+from kfp.onprem import mount_pvc, use_k8s_secret
+
+CACHE_DIR = os.getenv(
+    "FLTS_COMPILE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "flts"),
+)
+
+_BANNER = "=" * 70
 
 
 @dsl.pipeline(
@@ -82,6 +94,10 @@ def flts_pipeline(
 ):
     """FLTS forecasting pipeline using KFP v1 ContainerOp"""
     
+    # Weights are PipelineParams (resolved at run time), so json.dumps cannot
+    # serialize them here; build compact JSON around their placeholders once.
+    score_weights = f'{{"rmse":{rmse_weight},"mae":{mae_weight},"mse":{mse_weight}}}'
+    
     # Step 1: Preprocessing
     preprocess_op = dsl.ContainerOp(
         name='preprocess-data',
@@ -123,71 +139,47 @@ def flts_pipeline(
     
     preprocess_op.set_display_name('Preprocess Data')
     
-    # Step 2a: Train GRU
-    gru_op = dsl.ContainerOp(
-        name='train-gru',
-        image='train-container:latest',
-        file_outputs={
-            'model': '/tmp/outputs/model/data',
-            'metrics': '/tmp/outputs/metrics/data',
-            'run_id': '/tmp/outputs/run_id/data'
-        }
-    ).set_env_variable('USE_KFP', '1') \
-     .set_env_variable('MODEL_TYPE', 'GRU') \
-     .set_env_variable('CONFIG_HASH', preprocess_op.outputs['config_hash']) \
-     .set_env_variable('MLFLOW_TRACKING_URI', mlflow_tracking_uri) \
-     .set_env_variable('MLFLOW_S3_ENDPOINT_URL', mlflow_s3_endpoint) \
-     .set_env_variable('GATEWAY_URL', gateway_url) \
-     .set_env_variable('HIDDEN_SIZE', hidden_size) \
-     .set_env_variable('NUM_LAYERS', num_layers) \
-     .set_env_variable('DROPOUT', dropout) \
-     .set_env_variable('LEARNING_RATE', learning_rate) \
-     .set_env_variable('BATCH_SIZE', batch_size) \
-     .set_env_variable('NUM_EPOCHS', num_epochs) \
-     .set_env_variable('EARLY_STOPPING_PATIENCE', early_stopping_patience) \
-     .set_env_variable('WINDOW_SIZE', window_size) \
-     .set_env_variable('KFP_TRAINING_DATA_INPUT_PATH', preprocess_op.outputs['training_data']) \
-     .set_env_variable('KFP_MODEL_OUTPUT_PATH', '/tmp/outputs/model/data') \
-     .set_env_variable('KFP_METRICS_OUTPUT_PATH', '/tmp/outputs/metrics/data') \
-     .set_env_variable('KFP_RUN_ID_OUTPUT_PATH', '/tmp/outputs/run_id/data') \
-     .set_env_variable('AWS_ACCESS_KEY_ID', 'minio_access_key') \
-     .set_env_variable('AWS_SECRET_ACCESS_KEY', 'minio_secret_key')
-    
-    gru_op.set_display_name('Train GRU')
-    gru_op.after(preprocess_op)
+    # Resolve preprocess outputs once; every downstream op reuses these params
+    config_hash_out = preprocess_op.outputs['config_hash']
+    training_data_out = preprocess_op.outputs['training_data']
+    inference_data_out = preprocess_op.outputs['inference_data']
     
-    # Step 2b: Train LSTM
-    lstm_op = dsl.ContainerOp(
-        name='train-lstm',
-        image='train-container:latest',
-        file_outputs={
-            'model': '/tmp/outputs/model/data',
-            'metrics': '/tmp/outputs/metrics/data',
-            'run_id': '/tmp/outputs/run_id/data'
-        }
-    ).set_env_variable('USE_KFP', '1') \
-     .set_env_variable('MODEL_TYPE', 'LSTM') \
-     .set_env_variable('CONFIG_HASH', preprocess_op.outputs['config_hash']) \
-     .set_env_variable('MLFLOW_TRACKING_URI', mlflow_tracking_uri) \
-     .set_env_variable('MLFLOW_S3_ENDPOINT_URL', mlflow_s3_endpoint) \
-     .set_env_variable('GATEWAY_URL', gateway_url) \
-     .set_env_variable('HIDDEN_SIZE', hidden_size) \
-     .set_env_variable('NUM_LAYERS', num_layers) \
-     .set_env_variable('DROPOUT', dropout) \
-     .set_env_variable('LEARNING_RATE', learning_rate) \
-     .set_env_variable('BATCH_SIZE', batch_size) \
-     .set_env_variable('NUM_EPOCHS', num_epochs) \
-     .set_env_variable('EARLY_STOPPING_PATIENCE', early_stopping_patience) \
-     .set_env_variable('WINDOW_SIZE', window_size) \
-     .set_env_variable('KFP_TRAINING_DATA_INPUT_PATH', preprocess_op.outputs['training_data']) \
-     .set_env_variable('KFP_MODEL_OUTPUT_PATH', '/tmp/outputs/model/data') \
-     .set_env_variable('KFP_METRICS_OUTPUT_PATH', '/tmp/outputs/metrics/data') \
-     .set_env_variable('KFP_RUN_ID_OUTPUT_PATH', '/tmp/outputs/run_id/data') \
-     .set_env_variable('AWS_ACCESS_KEY_ID', 'minio_access_key') \
-     .set_env_variable('AWS_SECRET_ACCESS_KEY', 'minio_secret_key')
+    # Step 2a/2b: Train GRU and LSTM. Both run train-container and differ
+    # only in MODEL_TYPE, so build them from one factory to avoid drift.
+    def _make_train_op(model_type):
+        train_op = dsl.ContainerOp(
+            name=f'train-{model_type.lower()}',
+            image='train-container:latest',
+            file_outputs={
+                'model': '/tmp/outputs/model/data',
+                'metrics': '/tmp/outputs/metrics/data',
+                'run_id': '/tmp/outputs/run_id/data'
+            }
+        ).set_env_variable('USE_KFP', '1') \
+         .set_env_variable('MODEL_TYPE', model_type) \
+         .set_env_variable('CONFIG_HASH', config_hash_out) \
+         .set_env_variable('MLFLOW_TRACKING_URI', mlflow_tracking_uri) \
+         .set_env_variable('MLFLOW_S3_ENDPOINT_URL', mlflow_s3_endpoint) \
+         .set_env_variable('GATEWAY_URL', gateway_url) \
+         .set_env_variable('HIDDEN_SIZE', hidden_size) \
+         .set_env_variable('NUM_LAYERS', num_layers) \
+         .set_env_variable('DROPOUT', dropout) \
+         .set_env_variable('LEARNING_RATE', learning_rate) \
+         .set_env_variable('BATCH_SIZE', batch_size) \
+         .set_env_variable('NUM_EPOCHS', num_epochs) \
+         .set_env_variable('EARLY_STOPPING_PATIENCE', early_stopping_patience) \
+         .set_env_variable('WINDOW_SIZE', window_size) \
+         .set_env_variable('KFP_TRAINING_DATA_INPUT_PATH', training_data_out) \
+         .set_env_variable('KFP_MODEL_OUTPUT_PATH', '/tmp/outputs/model/data') \
+         .set_env_variable('KFP_METRICS_OUTPUT_PATH', '/tmp/outputs/metrics/data') \
+         .set_env_variable('KFP_RUN_ID_OUTPUT_PATH', '/tmp/outputs/run_id/data')
+        
+        train_op.set_display_name(f'Train {model_type}')
+        train_op.after(preprocess_op)
+        return train_op
     
-    lstm_op.set_display_name('Train LSTM')
-    lstm_op.after(preprocess_op)
+    gru_op = _make_train_op('GRU')
+    lstm_op = _make_train_op('LSTM')
     
     # Step 2c: Train Prophet
     prophet_op = dsl.ContainerOp(
@@ -200,7 +192,7 @@ def flts_pipeline(
         }
     ).set_env_variable('USE_KFP', '1') \
      .set_env_variable('MODEL_TYPE', 'PROPHET') \
-     .set_env_variable('CONFIG_HASH', preprocess_op.outputs['config_hash']) \
+     .set_env_variable('CONFIG_HASH', config_hash_out) \
      .set_env_variable('MLFLOW_TRACKING_URI', mlflow_tracking_uri) \
      .set_env_variable('MLFLOW_S3_ENDPOINT_URL', mlflow_s3_endpoint) \
      .set_env_variable('GATEWAY_URL', gateway_url) \
@@ -211,12 +203,10 @@ def flts_pipeline(
      .set_env_variable('DAILY_SEASONALITY', daily_seasonality) \
      .set_env_variable('WEEKLY_SEASONALITY', weekly_seasonality) \
      .set_env_variable('YEARLY_SEASONALITY', yearly_seasonality) \
-     .set_env_variable('KFP_TRAINING_DATA_INPUT_PATH', preprocess_op.outputs['training_data']) \
+     .set_env_variable('KFP_TRAINING_DATA_INPUT_PATH', training_data_out) \
      .set_env_variable('KFP_MODEL_OUTPUT_PATH', '/tmp/outputs/model/data') \
      .set_env_variable('KFP_METRICS_OUTPUT_PATH', '/tmp/outputs/metrics/data') \
-     .set_env_variable('KFP_RUN_ID_OUTPUT_PATH', '/tmp/outputs/run_id/data') \
-     .set_env_variable('AWS_ACCESS_KEY_ID', 'minio_access_key') \
-     .set_env_variable('AWS_SECRET_ACCESS_KEY', 'minio_secret_key')
+     .set_env_variable('KFP_RUN_ID_OUTPUT_PATH', '/tmp/outputs/run_id/data')
     
     prophet_op.set_display_name('Train Prophet')
     prophet_op.after(preprocess_op)
@@ -230,20 +220,18 @@ def flts_pipeline(
             'eval_metadata': '/tmp/outputs/eval_metadata/data'
         }
     ).set_env_variable('USE_KFP', '1') \
-     .set_env_variable('CONFIG_HASH', preprocess_op.outputs['config_hash']) \
+     .set_env_variable('CONFIG_HASH', config_hash_out) \
      .set_env_variable('IDENTIFIER', identifier) \
      .set_env_variable('MLFLOW_TRACKING_URI', mlflow_tracking_uri) \
      .set_env_variable('MLFLOW_S3_ENDPOINT_URL', mlflow_s3_endpoint) \
      .set_env_variable('GATEWAY_URL', gateway_url) \
      .set_env_variable('PROMOTION_BUCKET', promotion_bucket) \
-     .set_env_variable('SCORE_WEIGHTS', f'{{"rmse": {rmse_weight}, "mae": {mae_weight}, "mse": {mse_weight}}}') \
+     .set_env_variable('SCORE_WEIGHTS', score_weights) \
      .set_env_variable('KFP_GRU_MODEL_INPUT_PATH', gru_op.outputs['model']) \
      .set_env_variable('KFP_LSTM_MODEL_INPUT_PATH', lstm_op.outputs['model']) \
      .set_env_variable('KFP_PROPHET_MODEL_INPUT_PATH', prophet_op.outputs['model']) \
      .set_env_variable('KFP_PROMOTION_OUTPUT_PATH', '/tmp/outputs/promotion_pointer/data') \
-     .set_env_variable('KFP_EVAL_METADATA_OUTPUT_PATH', '/tmp/outputs/eval_metadata/data') \
-     .set_env_variable('AWS_ACCESS_KEY_ID', 'minio_access_key') \
-     .set_env_variable('AWS_SECRET_ACCESS_KEY', 'minio_secret_key')
+     .set_env_variable('KFP_EVAL_METADATA_OUTPUT_PATH', '/tmp/outputs/eval_metadata/data')
     
     eval_op.set_display_name('Evaluate & Promote Best Model')
     eval_op.after(gru_op, lstm_op, prophet_op)
@@ -267,47 +255,106 @@ def flts_pipeline(
      .set_env_variable('SAMPLE_IDX', sample_idx) \
      .set_env_variable('ENABLE_MICROBATCH', enable_microbatch) \
      .set_env_variable('BATCH_SIZE', inference_batch_size) \
-     .set_env_variable('KFP_INFERENCE_DATA_INPUT_PATH', preprocess_op.outputs['inference_data']) \
+     .set_env_variable('KFP_INFERENCE_DATA_INPUT_PATH', inference_data_out) \
      .set_env_variable('KFP_PROMOTED_MODEL_INPUT_PATH', eval_op.outputs['promotion_pointer']) \
      .set_env_variable('KFP_INFERENCE_RESULTS_OUTPUT_PATH', '/tmp/outputs/inference_results/data') \
      .set_env_variable('KFP_INFERENCE_METADATA_OUTPUT_PATH', '/tmp/outputs/inference_metadata/data') \
-     .set_env_variable('AWS_ACCESS_KEY_ID', 'minio_access_key') \
-     .set_env_variable('AWS_SECRET_ACCESS_KEY', 'minio_secret_key') \
      .set_env_variable('AWS_DEFAULT_REGION', 'us-east-1') \
      .set_env_variable('DISABLE_BUCKET_ENSURE', '0') \
      .set_env_variable('DISABLE_STARTUP_INFERENCE', '1')
     
     inference_op.set_display_name('Run Inference')
     inference_op.after(eval_op)
+    
+    # MinIO credentials come from the flts-secrets Secret instead of literal
+    # env values baked into every op in the compiled YAML. The Secret must
+    # exist in the pipeline namespace (kubeflow_pipeline/flts_secrets.yaml);
+    # the copy in k8s/services.yaml lives in `default` and is not visible here
+    minio_creds = use_k8s_secret(
+        secret_name='flts-secrets',
+        k8s_secret_key_to_env={
+            'AWS_ACCESS_KEY_ID': 'AWS_ACCESS_KEY_ID',
+            'AWS_SECRET_ACCESS_KEY': 'AWS_SECRET_ACCESS_KEY',
+        },
+    )
+    # Shared cache volume (kubeflow_pipeline/model_cache_pvc.yaml) so library
+    # and model downloads survive across pods instead of repeating per step
+    model_cache = mount_pvc(
+        pvc_name='flts-model-cache',
+        volume_name='model-cache',
+        volume_mount_path='/cache',
+    )
+    for op in (gru_op, lstm_op, prophet_op, eval_op, inference_op):
+        op.apply(minio_creds)
+        op.apply(model_cache)
+        op.set_env_variable('XDG_CACHE_HOME', '/cache')
+        op.set_env_variable('HF_HOME', '/cache/huggingface')
+    # Preprocess keeps its raw dataset downloads on the same volume
+    preprocess_op.apply(model_cache)
+    preprocess_op.set_env_variable('FLTS_CACHE_DIR', '/cache')
+    
+    # Every step talks to MinIO; retry transient storage errors with backoff
+    # rather than failing the whole DAG, and cap each attempt at one hour so
+    # a hung GET cannot pin a pod indefinitely
+    for op in (preprocess_op, gru_op, lstm_op, prophet_op, eval_op, inference_op):
+        op.set_retry(
+            num_retries=3,
+            policy='Always',
+            backoff_duration='30s',
+            backoff_factor=2,
+            backoff_max_duration='5m',
+        )
+        op.set_timeout(3600)
+        # Images are tagged :latest, for which Kubernetes defaults to Always;
+        # reuse the node's cached layers instead of re-pulling every step
+        op.container.set_image_pull_policy('IfNotPresent')
 
 
 def main():
     """Compile the pipeline to YAML"""
-    output_file = Path(__file__).parent / "flts_pipeline.yaml"
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flts_pipeline.yaml")
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    
+    sys.stdout.write(
+        f"{_BANNER}\n"
+        "FLTS Pipeline Compilation (KFP v1.8.22)\n"
+        f"{_BANNER}\n"
+        f"\nCompiling pipeline to: {output_file}\n\n"
+    )
     
-    print("="*70)
-    print("FLTS Pipeline Compilation (KFP v1.8.22)")
-    print("="*70)
-    print(f"\nCompiling pipeline to: {output_file}\n")
+    key = hashlib.sha256(
+        inspect.getsource(flts_pipeline).encode() + kfp.__version__.encode()
+    ).hexdigest()
+    cache_file = os.path.join(CACHE_DIR, f"{key}.yaml")
     
     try:
-        Compiler().compile(
-            pipeline_func=flts_pipeline,
-            package_path=str(output_file)
-        )
+        if os.path.exists(cache_file):
+            shutil.copyfile(cache_file, output_file)
+            print(f"Pipeline source unchanged, reused cached YAML: {cache_file}")
+        else:
+            Compiler().compile(
+                pipeline_func=flts_pipeline,
+                package_path=output_file
+            )
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                shutil.copyfile(output_file, cache_file)
+            except OSError as e:
+                print(f"WARNING: Could not cache compiled YAML: {e}")
         
-        if output_file.exists():
-            size = output_file.stat().st_size
-            print("="*70)
-            print(f"✓ SUCCESS: Pipeline YAML generated")
-            print(f"  Location: {output_file}")
-            print(f"  Size: {size:,} bytes")
-            print("="*70)
-            print("\nNext steps:")
-            print("  1. Review the YAML file")
-            print("  2. Upload to Kubeflow Pipelines")
-            print("  3. Create a pipeline run")
+        if os.path.exists(output_file):
+            size = os.path.getsize(output_file)
+            sys.stdout.write(
+                f"{_BANNER}\n"
+                "✓ SUCCESS: Pipeline YAML generated\n"
+                f"  Location: {output_file}\n"
+                f"  Size: {size:,} bytes\n"
+                f"{_BANNER}\n"
+                "\nNext steps:\n"
+                "  1. Review the YAML file\n"
+                "  2. Upload to Kubeflow Pipelines\n"
+                "  3. Create a pipeline run\n"
+            )
             return 0
         else:
             print("ERROR: Compilation succeeded but file not found")
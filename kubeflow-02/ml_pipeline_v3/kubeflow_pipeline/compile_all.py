@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Parallel Pipeline Compilation
+
+Runs the FLTS compile scripts concurrently, one process each, so producing
+both the v1 YAML and the v2 spec in CI takes max(v1, v2) wall time instead
+of the sum. Each compile is CPU-bound in a single thread, so separate
+processes give a real speedup on a 2+ core runner.
+
+The v1 script needs the KFP v1 SDK, which cannot be installed alongside
+KFP v2, so it can be run with its own interpreter via --v1-python.
+
+Usage:
+    # Compile v1 and v2 in parallel
+    python compile_all.py --v1-python /path/to/kfp-v1-venv/bin/python
+
+    # Compile only the v2 spec
+    python compile_all.py --skip-v1
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+V2_SCRIPT = os.path.join(PIPELINE_DIR, "compile_pipeline_v2.py")
+V1_SCRIPT = os.path.join(PIPELINE_DIR, "_deprecated", "compile_pipeline_v1.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile FLTS KFP pipelines in parallel",
+    )
+    parser.add_argument(
+        "--v2-output",
+        "-o",
+        default="artifacts/flts_pipeline_v2.json",
+        help="Output path for the v2 spec (default: artifacts/flts_pipeline_v2.json)",
+    )
+    parser.add_argument(
+        "--v1-python",
+        default=sys.executable,
+        help="Interpreter with KFP v1 installed (default: current interpreter)",
+    )
+    parser.add_argument(
+        "--skip-v1",
+        action="store_true",
+        help="Only compile the v2 spec",
+    )
+    args = parser.parse_args()
+
+    jobs = [("v2", [sys.executable, V2_SCRIPT, "--output", args.v2_output])]
+    if not args.skip_v1:
+        jobs.append(("v1", [args.v1_python, V1_SCRIPT]))
+
+    start = time.time()
+    procs = [
+        (name, subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True))
+        for name, cmd in jobs
+    ]
+
+    failed = []
+    for name, proc in procs:
+        output, _ = proc.communicate()
+        print(f"----- {name} (exit {proc.returncode}) -----")
+        print(output)
+        if proc.returncode != 0:
+            failed.append(name)
+
+    elapsed = time.time() - start
+    if failed:
+        print(f"✗ Compilation failed for: {', '.join(failed)} ({elapsed:.1f}s)")
+        return 1
+    print(f"✓ Compiled {len(jobs)} pipeline(s) in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,20 +12,95 @@ Usage:
     # Custom output location
     python compile_pipeline_v2.py --output custom/path/pipeline.json
     
+    # Force a fresh compile, bypassing the spec cache
+    python compile_pipeline_v2.py --no-cache
+    
 Environment:
     Requires KFP v2 (kfp>=2.0.0,<3.0.0) installed in the Python environment.
+    FLTS_COMPILE_CACHE_DIR overrides the spec cache location (~/.cache/flts).
 """
 
 import argparse
+import hashlib
+import inspect
 import os
+import shutil
 import sys
-from pathlib import Path
 
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CACHE_DIR = os.getenv(
+    "FLTS_COMPILE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "flts"),
+)
+
+_BANNER = "=" * 70
+
+
+def compute_cache_key() -> str:
+    """
+    Content hash of everything that determines the compiled spec.
+    
+    Covers the pipeline and component module sources plus the KFP version,
+    so editing either module or upgrading the SDK invalidates the cache.
+    """
+    import kfp
+    from kubeflow_pipeline import components_v2, pipeline_v2
+    
+    digest = hashlib.sha256()
+    for module in (pipeline_v2, components_v2):
+        digest.update(inspect.getsource(module).encode())
+    digest.update(kfp.__version__.encode())
+    return digest.hexdigest()
 
-from kfp import compiler
-from kubeflow_pipeline.pipeline_v2 import flts_pipeline
+
+def compile_spec(output: str, use_cache: bool = True) -> bool:
+    """
+    Compile flts_pipeline to output, reusing the spec cache when possible.
+    
+    Args:
+        output: Path of the compiled spec (.json or .yaml)
+        use_cache: Reuse/populate the spec cache in CACHE_DIR
+        
+    Returns:
+        True if a cached spec was reused, False if it was compiled
+    """
+    # KFP pulls in protobuf/kubernetes/grpc, so import it only once we know
+    # we are compiling (keeps --help and argument errors fast)
+    from kfp import compiler
+    from kubeflow_pipeline.pipeline_v2 import flts_pipeline, get_precompiled_spec
+    
+    cache_file = None
+    if use_cache:
+        # The compiler picks JSON or YAML from the extension, so key on it too
+        ext = os.path.splitext(output)[1] or ".yaml"
+        cache_file = os.path.join(CACHE_DIR, f"{compute_cache_key()}{ext}")
+    
+    if cache_file and os.path.exists(cache_file):
+        shutil.copyfile(cache_file, output)
+        return True
+    
+    if output.endswith(".json"):
+        # Shares the in-process compilation with any other caller
+        with open(output, "wb") as f:
+            f.write(get_precompiled_spec())
+    else:
+        compiler.Compiler().compile(
+            pipeline_func=flts_pipeline,
+            package_path=output,
+        )
+    if cache_file:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+            shutil.copyfile(output, tmp_path)
+            # A cache hit is any existing file, so never expose a partial one
+            # to an interrupted or concurrent compile; publish it atomically
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            print(f"⚠ Could not cache compiled spec: {e}")
+    return False
 
 
 def main():
@@ -48,49 +123,57 @@ Examples:
     parser.add_argument(
         "--output",
         "-o",
-        type=Path,
-        default=Path("artifacts/flts_pipeline_v2.json"),
+        default="artifacts/flts_pipeline_v2.json",
         help="Output path for compiled pipeline spec (default: artifacts/flts_pipeline_v2.json)",
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always recompile instead of reusing a cached spec",
+    )
+    
     args = parser.parse_args()
     
     # Ensure output directory exists
-    args.output.parent.mkdir(parents=True, exist_ok=True)
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     
-    print("=" * 70)
-    print("KFP v2 Pipeline Compilation")
-    print("=" * 70)
-    print()
-    print(f"Pipeline: flts_pipeline")
-    print(f"Output:   {args.output}")
-    print()
+    sys.stdout.write(
+        f"{_BANNER}\n"
+        "KFP v2 Pipeline Compilation\n"
+        f"{_BANNER}\n"
+        "\n"
+        "Pipeline: flts_pipeline\n"
+        f"Output:   {args.output}\n"
+        "\n"
+    )
     
     try:
-        # Compile using KFP v2 compiler
-        compiler.Compiler().compile(
-            pipeline_func=flts_pipeline,
-            package_path=str(args.output),
-        )
+        if compile_spec(args.output, use_cache=not args.no_cache):
+            print(f"✓ Pipeline source unchanged, reused cached spec from {CACHE_DIR}")
         
         # Verify output file
-        if not args.output.exists():
+        if not os.path.exists(args.output):
             raise RuntimeError(f"Compilation succeeded but output file not found: {args.output}")
         
-        file_size = args.output.stat().st_size
+        file_size = os.path.getsize(args.output)
         
-        print("✓ Compilation successful")
-        print()
-        print(f"Compiled pipeline spec:")
-        print(f"  Path: {args.output}")
-        print(f"  Size: {file_size:,} bytes")
-        print()
-        print("=" * 70)
-        print("Next steps:")
-        print("  1. Review the generated JSON spec")
-        print("  2. Upload to Kubeflow Pipelines UI (Step 9)")
-        print("  3. Create a run with desired parameters")
-        print("=" * 70)
+        sys.stdout.write(
+            "✓ Compilation successful\n"
+            "\n"
+            "Compiled pipeline spec:\n"
+            f"  Path: {args.output}\n"
+            f"  Size: {file_size:,} bytes\n"
+            "\n"
+            f"{_BANNER}\n"
+            "Next steps:\n"
+            "  1. Review the generated JSON spec\n"
+            "  2. Upload to Kubeflow Pipelines UI (Step 9)\n"
+            "  3. Create a run with desired parameters\n"
+            f"{_BANNER}\n"
+        )
         
         return 0
         
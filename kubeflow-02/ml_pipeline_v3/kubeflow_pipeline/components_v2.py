@@ -6,12 +6,13 @@ These components replace the YAML-based component definitions and are the single
 source of truth for the KFP v2 pipeline.
 
 Components:
-1. preprocess_component - Data preprocessing
-2. train_gru_component - GRU model training
-3. train_lstm_component - LSTM model training
-4. train_prophet_component - Prophet model training
-5. eval_component - Model evaluation and promotion
-6. inference_component - Inference execution
+1. preprocess_train_component - Training split preprocessing
+2. preprocess_test_component - Inference split preprocessing
+3. train_gru_component - GRU model training
+4. train_lstm_component - LSTM model training
+5. train_prophet_component - Prophet model training
+6. eval_component - Model evaluation and promotion
+7. inference_component - Inference execution
 
 Note: The container images handle the actual execution logic. These component
 definitions specify the interface contract and let KFP v2 handle orchestration.
@@ -24,13 +25,49 @@ from typing import Optional
 @dsl.component(
     base_image="flts-preprocess:latest",
 )
-def preprocess_component(
+def preprocess_train_component(
     training_data: dsl.Output[dsl.Dataset],
-    inference_data: dsl.Output[dsl.Dataset],
     config_hash: dsl.OutputPath(str),
     config_json: dsl.OutputPath(str),
     dataset_name: str = "PobleSec",
-    identifier: str = "default",
+    sample_train_rows: int = 0,
+    sample_strategy: str = "head",
+    sample_seed: int = 42,
+    force_reprocess: int = 0,
+    extra_hash_salt: str = "",
+    handle_nans: bool = True,
+    nans_threshold: float = 0.33,
+    nans_knn: int = 2,
+    clip_enable: bool = False,
+    clip_method: str = "iqr",
+    clip_factor: float = 1.5,
+    time_features_enable: bool = True,
+    lags_enable: bool = False,
+    lags_n: int = 0,
+    scaler: str = "MinMaxScaler",
+    gateway_url: str = "http://fastapi-app:8000",
+    input_bucket: str = "dataset",
+    output_bucket: str = "processed-data",
+):
+    """
+    Preprocess the raw training split into the training dataset.
+    
+    The container image (flts-preprocess:latest) handles the actual preprocessing logic,
+    run with PREPROCESS_SPLITS=train (set on the task by flts_pipeline). KFP v2 will pass these parameters to the container,
+    which reads them and writes outputs to the specified paths.
+    
+    Takes no run identifier and no test-side sampling knobs: every input here is
+    part of the KFP cache key, and the trainers inherit it through training_data.
+    """
+    pass  # Container handles execution
+
+
+@dsl.component(
+    base_image="flts-preprocess:latest",
+)
+def preprocess_test_component(
+    inference_data: dsl.Output[dsl.Dataset],
+    dataset_name: str = "PobleSec",
     sample_train_rows: int = 0,
     sample_test_rows: int = 0,
     sample_strategy: str = "head",
@@ -52,11 +89,11 @@ def preprocess_component(
     output_bucket: str = "processed-data",
 ):
     """
-    Preprocess raw time-series data into training and inference datasets.
+    Preprocess the raw test split into the inference dataset.
     
-    The container image (flts-preprocess:latest) handles the actual preprocessing logic.
-    KFP v2 will pass these parameters to the container, which reads them and writes
-    outputs to the specified paths.
+    The container image (flts-preprocess:latest) handles the actual preprocessing logic,
+    run with PREPROCESS_SPLITS=test (set on the task by flts_pipeline). The scaler is still fitted on the (sampled)
+    training split, so the training-side inputs are part of this task's key too.
     """
     pass  # Container handles execution
 
@@ -73,12 +110,7 @@ def train_gru_component(
     mlflow_tracking_uri: str = "http://mlflow:5000",
     mlflow_s3_endpoint: str = "http://minio:9000",
     gateway_url: str = "http://fastapi-app:8000",
-    hidden_size: int = 64,
-    num_layers: int = 2,
-    dropout: float = 0.2,
-    learning_rate: float = 0.001,
-    batch_size: int = 32,
-    num_epochs: int = 50,
+    train_config: Optional[dict] = None,
     early_stopping_patience: int = 10,
     window_size: int = 12,
 ):
@@ -86,6 +118,8 @@ def train_gru_component(
     Train GRU (Gated Recurrent Unit) model for time-series forecasting.
     
     Container: train-container:latest with MODEL_TYPE=GRU env variable.
+    train_config holds hidden_size, num_layers, dropout, learning_rate,
+    batch_size and num_epochs; flts_pipeline builds it once for both trainers.
     """
     pass
 
@@ -102,12 +136,7 @@ def train_lstm_component(
     mlflow_tracking_uri: str = "http://mlflow:5000",
     mlflow_s3_endpoint: str = "http://minio:9000",
     gateway_url: str = "http://fastapi-app:8000",
-    hidden_size: int = 64,
-    num_layers: int = 2,
-    dropout: float = 0.2,
-    learning_rate: float = 0.001,
-    batch_size: int = 32,
-    num_epochs: int = 50,
+    train_config: Optional[dict] = None,
     early_stopping_patience: int = 10,
     window_size: int = 12,
 ):
@@ -115,6 +144,8 @@ def train_lstm_component(
     Train LSTM (Long Short-Term Memory) model for time-series forecasting.
     
     Container: train-container:latest with MODEL_TYPE=LSTM env variable.
+    train_config holds hidden_size, num_layers, dropout, learning_rate,
+    batch_size and num_epochs; flts_pipeline builds it once for both trainers.
     """
     pass
 
@@ -200,29 +231,3 @@ def inference_component(
     on the inference dataset.
     """
     pass
-
-
-# Smoke test to verify component signatures
-if __name__ == "__main__":
-    print("KFP v2 Components Smoke Test")
-    print("=" * 70)
-    
-    components = [
-        ("preprocess_component", preprocess_component),
-        ("train_gru_component", train_gru_component),
-        ("train_lstm_component", train_lstm_component),
-        ("train_prophet_component", train_prophet_component),
-        ("eval_component", eval_component),
-        ("inference_component", inference_component),
-    ]
-    
-    for name, comp_func in components:
-        # Verify it's a component
-        if hasattr(comp_func, 'component_spec'):
-            print(f"✓ {name}: Valid KFP v2 component")
-        else:
-            print(f"✗ {name}: NOT a valid component")
-            raise ValueError(f"{name} is not decorated as @dsl.component")
-    
-    print("=" * 70)
-    print(f"✓ All {len(components)} components validated successfully")
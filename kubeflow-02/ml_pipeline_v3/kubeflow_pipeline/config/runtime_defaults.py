@@ -17,18 +17,21 @@ Usage:
     print(config.minio_endpoint)  # "custom-minio:9000"
 """
 
+import functools
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuntimeConfig:
     """
     Runtime configuration for KFP v2 pipeline execution in-cluster.
     
     All values have defaults suitable for development/Minikube deployment.
     Override via environment variables or pass to pipeline parameters.
+    Instances are immutable; use dataclasses.replace() to derive variants.
     """
     
     # ========================================================================
@@ -103,14 +106,25 @@ class RuntimeConfig:
     aws_region: str = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
     aws_addressing_style: str = os.getenv("AWS_S3_ADDRESSING_STYLE", "path")
     
-    def to_env_dict(self) -> dict:
-        """
-        Convert configuration to environment variable dictionary.
-        Useful for setting component environment variables.
-        
-        Returns:
-            Dictionary of env var name -> value
-        """
+    # ========================================================================
+    # Shared Cache Volume (flts-model-cache PVC)
+    # ========================================================================
+    
+    # Exported by to_env_dict for the v1 pipeline and manual runs; the v2
+    # pipeline neither mounts the PVC nor sets FLTS_CACHE_DIR on its tasks
+    cache_dir: str = os.getenv("FLTS_CACHE_DIR", "/cache")
+    
+    # Derived dicts, populated once in __post_init__
+    _env_dict: dict = field(init=False, repr=False, compare=False)
+    _pipeline_params: dict = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Both dicts are read repeatedly while building a pipeline; build them
+        # once per instance and hand out read-only views
+        object.__setattr__(self, "_env_dict", self._build_env_dict())
+        object.__setattr__(self, "_pipeline_params", self._build_pipeline_params())
+    
+    def _build_env_dict(self) -> dict:
         return {
             # MinIO
             "MINIO_ENDPOINT": self.minio_endpoint,
@@ -138,15 +152,14 @@ class RuntimeConfig:
             "AWS_S3_ADDRESSING_STYLE": self.aws_addressing_style,
             "AWS_ACCESS_KEY_ID": self.minio_access_key,
             "AWS_SECRET_ACCESS_KEY": self.minio_secret_key,
+            
+            # Cache (step images run as a user without a writable home)
+            "FLTS_CACHE_DIR": self.cache_dir,
+            "XDG_CACHE_HOME": self.cache_dir,
+            "HF_HOME": f"{self.cache_dir}/huggingface",
         }
     
-    def to_pipeline_params(self) -> dict:
-        """
-        Convert configuration to KFP pipeline parameter dictionary.
-        
-        Returns:
-            Dictionary of parameter name -> value
-        """
+    def _build_pipeline_params(self) -> dict:
         return {
             "gateway_url": self.gateway_url,
             "mlflow_tracking_uri": self.mlflow_tracking_uri,
@@ -154,6 +167,27 @@ class RuntimeConfig:
             "identifier": self.default_identifier,
         }
     
+    def to_env_dict(self) -> Mapping[str, str]:
+        """
+        Convert configuration to environment variable dictionary.
+        Useful for setting component environment variables.
+        
+        Returns:
+            Read-only mapping of env var name -> value
+            (use dict(...) for a mutable copy)
+        """
+        return MappingProxyType(self._env_dict)
+    
+    def to_pipeline_params(self) -> Mapping[str, str]:
+        """
+        Convert configuration to KFP pipeline parameter dictionary.
+        
+        Returns:
+            Read-only mapping of parameter name -> value
+            (use dict(...) for a mutable copy)
+        """
+        return MappingProxyType(self._pipeline_params)
+    
     def __repr__(self) -> str:
         """Safe string representation (masks secrets)."""
         return (
@@ -171,25 +205,20 @@ class RuntimeConfig:
 # Deployment-Specific Presets
 # ============================================================================
 
-class DevConfig(RuntimeConfig):
-    """Development/Minikube configuration (same as RuntimeConfig defaults)."""
-    pass
-
+# Development/Minikube configuration (same as RuntimeConfig defaults)
+_DEV = RuntimeConfig()
 
-class ProdConfig(RuntimeConfig):
-    """
-    Production configuration.
-    Override with production endpoints/credentials.
-    """
-    def __init__(self):
-        super().__init__()
-        # Example production overrides
-        # self.minio_endpoint = "minio.prod.example.com:9000"
-        # self.minio_secure = True
-        # self.mlflow_tracking_uri = "http://mlflow.prod.example.com:5000"
-        pass
+# Production configuration: field overrides applied on top of the dev defaults
+# with dataclasses.replace(). Fill in production endpoints/credentials.
+_PROD_OVERRIDES = {
+    # Example production overrides
+    # "minio_endpoint": "minio.prod.example.com:9000",
+    # "minio_secure": True,
+    # "mlflow_tracking_uri": "http://mlflow.prod.example.com:5000",
+}
 
 
+@functools.lru_cache(maxsize=4)
 def get_config(env: str = "dev") -> RuntimeConfig:
     """
     Factory function to get configuration by environment.
@@ -198,13 +227,13 @@ def get_config(env: str = "dev") -> RuntimeConfig:
         env: Environment name ('dev', 'prod')
         
     Returns:
-        RuntimeConfig instance
+        RuntimeConfig instance, shared between calls with the same env
     """
     env = env.lower()
     if env == "prod":
-        return ProdConfig()
+        return replace(_DEV, **_PROD_OVERRIDES)
     else:
-        return DevConfig()
+        return _DEV
 
 
 # ============================================================================
@@ -212,7 +241,7 @@ def get_config(env: str = "dev") -> RuntimeConfig:
 # ============================================================================
 
 # Default instance for convenient imports
-DEFAULT_CONFIG = RuntimeConfig()
+DEFAULT_CONFIG = get_config("dev")
 
 # Service endpoints (for backward compatibility)
 MINIO_ENDPOINT = DEFAULT_CONFIG.minio_endpoint
@@ -8,15 +8,39 @@ Usage:
     # Full workflow: compile → upload → create experiment → run
     python submit_run_v2.py
     
-    # Skip compilation (use existing spec)
+    # Skip compilation (use existing spec, e.g. prebuilt in CI with
+    # compile_pipeline_v2.py); the pipeline module is then never imported
     python submit_run_v2.py --skip-compile
     
+    # Recompile even if the pipeline source is unchanged (otherwise the spec
+    # cache shared with compile_pipeline_v2.py is reused)
+    python submit_run_v2.py --no-compile-cache
+    
     # Custom parameters
     python submit_run_v2.py --dataset ElBorn --identifier step10-test-001 --experiment step10-validation
     
     # Dry run (compile + validate only)
     python submit_run_v2.py --dry-run
     
+    # Re-execute every step even if a cached result exists
+    python submit_run_v2.py --no-caching
+    
+    # Reuse cached preprocess/training results for at most 7 days
+    python submit_run_v2.py --cache-window-hours 168
+    
+Caching:
+    KFP step caching is on by default: a step whose image, command and inputs
+    match a previous successful execution is skipped and its outputs reused.
+    Per-run values such as the identifier must therefore be passed as pipeline
+    parameters, never baked into a component's environment, or every run gets
+    a distinct cache key.
+    
+    KFP v2 has no max_cache_staleness, so reuse can be bounded here instead:
+    with --cache-window-hours N, force_reprocess is set to the index of the
+    current N-hour window, which re-keys preprocess, and through its outputs
+    training and eval, once per window. --force-reprocess sets the value
+    directly and takes precedence. Inference is never cached.
+    
 Requirements:
     - KFP v2 SDK installed (kfp>=2.0.0)
     - kubectl configured with access to Kubeflow cluster
@@ -24,17 +48,26 @@ Requirements:
 """
 
 import argparse
+import asyncio
+import atexit
+import io
 import json
 import os
 import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import List, Optional, Tuple
 
 try:
     import kfp
-    from kfp import compiler
+    import requests
     from kfp.client import Client
+    from kfp_server_api.exceptions import ApiException
 except ImportError:
     print("Error: kfp package not installed")
     print("Install with: pip install 'kfp>=2.0.0,<3.0.0'")
@@ -43,8 +76,7 @@ except ImportError:
 # Add parent directory for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from kubeflow_pipeline.pipeline_v2 import flts_pipeline
-from kubeflow_pipeline.config.runtime_defaults import RuntimeConfig
+from kubeflow_pipeline.config.runtime_defaults import get_config
 
 
 class Color:
@@ -59,36 +91,122 @@ class Color:
     BOLD = '\033[1m'
 
 
+# Escape sequences combined once at import instead of on every message
+_RESET = Color.END
+_HEADER_PREFIX = Color.HEADER + Color.BOLD
+_HEADER_BAR = _HEADER_PREFIX + "=" * 80 + _RESET
+_STEP_PREFIX = Color.CYAN + Color.BOLD
+_SUCCESS_PREFIX = Color.GREEN + "✓ "
+_ERROR_PREFIX = Color.RED + "✗ "
+_WARNING_PREFIX = Color.YELLOW + "⚠ "
+_INFO_PREFIX = Color.BLUE + "ℹ "
+
+
+# Training hyperparameters submitted with every run (same values as the
+# flts_pipeline defaults); main() overlays the CLI-controlled parameters
+_DEFAULT_PARAMS = MappingProxyType({
+    "hidden_size": 64,
+    "num_layers": 2,
+    "dropout": 0.2,
+    "learning_rate": 0.001,
+    "batch_size": 32,
+    "num_epochs": 50,
+})
+
+
+# Messages are buffered and written to stdout once per step (and on errors
+# and exit) rather than one write per line. Each thread has its own buffer,
+# since steps 1-2 and 3-4 run in parallel worker threads; there the output is
+# captured (see _captured) and written by the caller in step order.
+_OUTPUT = threading.local()
+_STDOUT_LOCK = threading.Lock()
+
+
+def _buffer() -> io.StringIO:
+    """This thread's output buffer."""
+    buffer = getattr(_OUTPUT, "buffer", None)
+    if buffer is None:
+        buffer = _OUTPUT.buffer = io.StringIO()
+    return buffer
+
+
+def _take_output() -> str:
+    """Return and clear this thread's queued output."""
+    buffer = _buffer()
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def _emit(line: str):
+    """Queue one line of output."""
+    _buffer().write(line + "\n")
+
+
+def flush_output():
+    """Write this thread's queued output to stdout in a single call.
+    
+    A no-op inside a captured step: its output goes back to the caller.
+    """
+    if getattr(_OUTPUT, "captured", False):
+        return
+    text = _take_output()
+    if text:
+        with _STDOUT_LOCK:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+
+def _captured(fn, *args):
+    """Call fn(*args), returning (result, the output it produced)."""
+    _OUTPUT.captured = True
+    try:
+        result = fn(*args)
+    finally:
+        _OUTPUT.captured = False
+    return result, _take_output()
+
+
+def _replay(*outputs: str):
+    """Write captured step output, in the order given."""
+    _buffer().write("".join(outputs))
+    flush_output()
+
+
+atexit.register(flush_output)
+
+
 def print_header(msg: str):
     """Print section header."""
-    print(f"\n{Color.HEADER}{Color.BOLD}{'='*80}{Color.END}")
-    print(f"{Color.HEADER}{Color.BOLD}{msg}{Color.END}")
-    print(f"{Color.HEADER}{Color.BOLD}{'='*80}{Color.END}\n")
+    _emit("\n" + _HEADER_BAR + "\n" + _HEADER_PREFIX + msg + _RESET + "\n" + _HEADER_BAR + "\n")
 
 
 def print_step(step: str, msg: str):
-    """Print step message."""
-    print(f"{Color.CYAN}{Color.BOLD}[{step}]{Color.END} {msg}")
+    """Print step message, flushing the previous step's output with it."""
+    _emit(f"{_STEP_PREFIX}[{step}]{_RESET} {msg}")
+    flush_output()
 
 
 def print_success(msg: str):
     """Print success message."""
-    print(f"{Color.GREEN}✓ {msg}{Color.END}")
+    _emit(_SUCCESS_PREFIX + msg + _RESET)
 
 
 def print_error(msg: str):
-    """Print error message."""
-    print(f"{Color.RED}✗ {msg}{Color.END}")
+    """Print error message (flushed so it precedes any traceback on stderr)."""
+    _emit(_ERROR_PREFIX + msg + _RESET)
+    flush_output()
 
 
 def print_warning(msg: str):
     """Print warning message."""
-    print(f"{Color.YELLOW}⚠ {msg}{Color.END}")
+    _emit(_WARNING_PREFIX + msg + _RESET)
 
 
 def print_info(msg: str):
     """Print info message."""
-    print(f"{Color.BLUE}ℹ {msg}{Color.END}")
+    _emit(_INFO_PREFIX + msg + _RESET)
 
 
 class KFPSubmitter:
@@ -101,13 +219,25 @@ class KFPSubmitter:
         skip_compile: bool = False,
         pipeline_spec_path: Optional[Path] = None,
         dry_run: bool = False,
+        enable_caching: bool = True,
+        use_compile_cache: bool = True,
     ):
         self.kfp_host = kfp_host
         self.namespace = namespace
         self.skip_compile = skip_compile
         self.pipeline_spec_path = pipeline_spec_path or Path("artifacts/flts_pipeline_v2.json")
         self.dry_run = dry_run
+        self.enable_caching = enable_caching
+        self.use_compile_cache = use_compile_cache
         self.client: Optional[Client] = None
+        # Uploaded pipeline version; runs reference it instead of resending the spec
+        self.pipeline_id: Optional[str] = None
+        self.pipeline_version_id: Optional[str] = None
+        # Gateway/MLflow URLs of the run being submitted, warmed on connect
+        self.service_urls: Tuple[str, ...] = ()
+        # Exceptions from failed steps; tracebacks are printed once, by
+        # submit_pipeline, and only if the submission fails
+        self.failures: List[Exception] = []
         
         # Paths
         self.repo_root = Path(__file__).parent.parent
@@ -124,13 +254,18 @@ class KFPSubmitter:
             return True
         
         try:
+            # Only import the pipeline when compiling: building the component
+            # specs is the bulk of the cost, and --skip-compile submissions of a
+            # prebuilt spec (compile_pipeline_v2.py) never need it
+            from kubeflow_pipeline.compile_pipeline_v2 import compile_spec
+            from kubeflow_pipeline.pipeline_v2 import flts_pipeline
+            
             print_info(f"Pipeline function: flts_pipeline")
             print_info(f"Output path: {self.pipeline_spec_path}")
             
-            compiler.Compiler().compile(
-                pipeline_func=flts_pipeline,
-                package_path=str(self.pipeline_spec_path),
-            )
+            # Keyed on the pipeline/component sources and the kfp version
+            if compile_spec(str(self.pipeline_spec_path), use_cache=self.use_compile_cache):
+                print_info("Compile cache hit (pipeline source unchanged)")
             
             if not self.pipeline_spec_path.exists():
                 raise FileNotFoundError(f"Compiled spec not found: {self.pipeline_spec_path}")
@@ -138,20 +273,40 @@ class KFPSubmitter:
             file_size = self.pipeline_spec_path.stat().st_size
             print_success(f"Compilation successful ({file_size:,} bytes)")
             
-            # Validate JSON structure
-            with open(self.pipeline_spec_path) as f:
-                spec = json.load(f)
-                print_info(f"Pipeline name: {spec.get('pipelineInfo', {}).get('name', 'N/A')}")
-                print_info(f"SDK version: {spec.get('sdkVersion', 'N/A')}")
+            # Both are known in-process; no need to read the spec back
+            print_info(f"Pipeline name: {flts_pipeline.pipeline_spec.pipeline_info.name}")
+            print_info(f"SDK version: kfp-{kfp.__version__}")
             
             return True
             
         except Exception as e:
             print_error(f"Compilation failed: {e}")
-            import traceback
-            traceback.print_exc()
+            self.failures.append(e)
             return False
     
+    def _prefetch_services(self):
+        """Warm DNS and connection pools of the services the run will hit.
+        
+        Fire-and-forget HEAD requests to the gateway and MLflow URLs the run
+        is submitted with, so the lookups are cached by the time the first
+        pods start. Purely a prefetch: errors are ignored and nothing waits
+        on the result.
+        """
+        urls = [f"{url.rstrip('/')}/health" for url in self.service_urls]
+        if not urls:
+            return
+        
+        def head(url: str):
+            try:
+                requests.head(url, timeout=2.0)
+            except Exception:
+                pass
+        
+        executor = ThreadPoolExecutor(max_workers=len(urls))
+        for url in urls:
+            executor.submit(head, url)
+        executor.shutdown(wait=False)
+    
     def connect_to_kfp(self) -> bool:
         """Establish connection to KFP API server."""
         print_step("2/5", "Connecting to KFP")
@@ -164,10 +319,14 @@ class KFPSubmitter:
             print_info(f"KFP host: {self.kfp_host}")
             print_info(f"Namespace: {self.namespace}")
             
+            # One Client for the whole submission: its service APIs share a
+            # single ApiClient, so every call reuses the same keep-alive
+            # urllib3 pool (cpu_count * 5 connections) to the API server
             self.client = Client(
                 host=self.kfp_host,
                 namespace=self.namespace,
             )
+            self._prefetch_services()
             
             # Test connection
             print_info("Testing connection...")
@@ -180,12 +339,40 @@ class KFPSubmitter:
             
         except Exception as e:
             print_error(f"Connection failed: {e}")
+            self.failures.append(e)
             print_info("\nTroubleshooting:")
             print_info("  1. Verify KFP is running: kubectl get pods -n kubeflow")
             print_info("  2. Port-forward if needed: kubectl port-forward -n kubeflow svc/ml-pipeline-ui 8080:80")
             print_info("  3. Check --host parameter matches your setup")
             return False
     
+    def _find_pipeline(self, pipeline_name: str):
+        """Return the uploaded pipeline named pipeline_name, or None."""
+        # Let the API server match the name and return at most one row
+        # instead of pulling a page of the catalog and scanning it here
+        name_filter = json.dumps({
+            "predicates": [{
+                "operation": "EQUALS",
+                "key": "display_name",
+                "stringValue": pipeline_name,
+            }]
+        })
+        try:
+            pipelines = self.client.list_pipelines(filter=name_filter, page_size=1)
+            return (pipelines.pipelines or [None])[0]
+        except ApiException as e:
+            # Older API servers reject the predicate; fall back to a scan.
+            # Auth and availability errors would fail the scan too.
+            # (status is None when no HTTP response was received)
+            if e.status is not None and (e.status in (401, 403) or e.status >= 502):
+                raise
+        
+        pipelines = self.client.list_pipelines(page_size=100)
+        for pipeline in (pipelines.pipelines or []):
+            if pipeline.display_name == pipeline_name:
+                return pipeline
+        return None
+    
     def upload_pipeline(self, pipeline_name: str) -> Optional[str]:
         """Upload pipeline to KFP."""
         print_step("3/5", "Uploading Pipeline")
@@ -196,15 +383,7 @@ class KFPSubmitter:
         
         try:
             # Check if pipeline already exists
-            existing = None
-            try:
-                pipelines = self.client.list_pipelines(page_size=100)
-                for pipeline in (pipelines.pipelines or []):
-                    if pipeline.display_name == pipeline_name:
-                        existing = pipeline
-                        break
-            except:
-                pass
+            existing = self._find_pipeline(pipeline_name)
             
             if existing:
                 print_info(f"Pipeline '{pipeline_name}' already exists (ID: {existing.pipeline_id})")
@@ -218,6 +397,7 @@ class KFPSubmitter:
                 )
                 
                 pipeline_id = existing.pipeline_id
+                self.pipeline_version_id = pipeline.pipeline_version_id
                 print_success(f"New version uploaded: {pipeline.name}")
                 
             else:
@@ -229,15 +409,19 @@ class KFPSubmitter:
                 )
                 
                 pipeline_id = pipeline.pipeline_id
+                # A new pipeline has exactly one version, created by the upload
+                versions = self.client.list_pipeline_versions(pipeline_id=pipeline_id, page_size=1)
+                if versions.pipeline_versions:
+                    self.pipeline_version_id = versions.pipeline_versions[0].pipeline_version_id
                 print_success(f"Pipeline uploaded: {pipeline_name}")
             
             print_info(f"Pipeline ID: {pipeline_id}")
+            self.pipeline_id = pipeline_id
             return pipeline_id
             
         except Exception as e:
             print_error(f"Upload failed: {e}")
-            import traceback
-            traceback.print_exc()
+            self.failures.append(e)
             return None
     
     def create_experiment(self, experiment_name: str) -> Optional[str]:
@@ -250,11 +434,14 @@ class KFPSubmitter:
         
         try:
             # Try to get existing experiment
-            experiment = None
             try:
                 experiment = self.client.get_experiment(experiment_name=experiment_name)
                 print_info(f"Using existing experiment: {experiment_name}")
-            except:
+            except (ApiException, ValueError) as e:
+                # A name lookup that matches nothing raises ValueError; any
+                # API error other than 404 is a real failure
+                if isinstance(e, ApiException) and e.status != 404:
+                    raise
                 # Create new experiment
                 print_info(f"Creating new experiment: {experiment_name}")
                 experiment = self.client.create_experiment(name=experiment_name)
@@ -267,8 +454,7 @@ class KFPSubmitter:
             
         except Exception as e:
             print_error(f"Experiment setup failed: {e}")
-            import traceback
-            traceback.print_exc()
+            self.failures.append(e)
             return None
     
     def create_run(
@@ -289,18 +475,36 @@ class KFPSubmitter:
         
         try:
             print_info(f"Run name: {run_name}")
+            print_info(f"Caching: {'enabled' if self.enable_caching else 'disabled'}")
             print_info(f"Parameters:")
             for key, value in pipeline_params.items():
                 print_info(f"  {key}: {value}")
             
-            # Create run from pipeline package
-            run = self.client.create_run_from_pipeline_package(
-                pipeline_file=str(self.pipeline_spec_path),
-                experiment_id=experiment_id,
-                run_name=run_name,
-                arguments=pipeline_params,
-                enable_caching=False,  # Disable caching for reproducibility
-            )
+            # kfp only applies an enable_caching override to a spec it reads
+            # from disk (_override_caching_options), never to an uploaded
+            # version, so --no-caching must resubmit the package
+            if self.pipeline_version_id and self.enable_caching:
+                # Run the version uploaded in step 3 by reference: the API
+                # server already holds the spec, so it is neither reread from
+                # disk nor sent a second time
+                run = self.client.run_pipeline(
+                    experiment_id=experiment_id,
+                    job_name=run_name,
+                    params=pipeline_params,
+                    pipeline_id=self.pipeline_id,
+                    version_id=self.pipeline_version_id,
+                )
+            else:
+                # Create run from pipeline package
+                run = self.client.create_run_from_pipeline_package(
+                    pipeline_file=str(self.pipeline_spec_path),
+                    experiment_id=experiment_id,
+                    run_name=run_name,
+                    arguments=pipeline_params,
+                    # None keeps the compiled per-task options (inference is
+                    # never cached); True would re-enable caching on every task
+                    enable_caching=None if self.enable_caching else False,
+                )
             
             run_id = run.run_id
             print_success(f"Run started successfully")
@@ -315,10 +519,46 @@ class KFPSubmitter:
             
         except Exception as e:
             print_error(f"Run creation failed: {e}")
-            import traceback
-            traceback.print_exc()
+            self.failures.append(e)
             return None
     
+    async def _prepare_async(
+        self,
+        pipeline_name: str,
+        experiment_name: str,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Run steps 1-4, overlapping the steps that do not depend on each other.
+        
+        Compilation is local and the connection probe is a round-trip to the
+        API server, so they run together; upload and experiment setup then
+        only share the connected client. The kfp Client is blocking, so each
+        step runs in a worker thread and its output is printed once both
+        steps of a pair have finished, in step order.
+        
+        Returns:
+            (pipeline_id, experiment_id), with None for any step that failed
+        """
+        (compiled, compile_output), (connected, connect_output) = await asyncio.gather(
+            asyncio.to_thread(_captured, self.compile_pipeline),
+            asyncio.to_thread(_captured, self.connect_to_kfp),
+        )
+        _replay(compile_output, connect_output)
+        if not (compiled and connected):
+            return None, None
+        
+        (pipeline_id, upload_output), (experiment_id, experiment_output) = await asyncio.gather(
+            asyncio.to_thread(_captured, self.upload_pipeline, pipeline_name),
+            asyncio.to_thread(_captured, self.create_experiment, experiment_name),
+        )
+        _replay(upload_output, experiment_output)
+        return pipeline_id, experiment_id
+    
+    def print_failures(self):
+        """Print the traceback of every step that failed."""
+        flush_output()
+        for failure in self.failures:
+            traceback.print_exception(failure)
+    
     def submit_pipeline(
         self,
         pipeline_name: str,
@@ -337,45 +577,43 @@ class KFPSubmitter:
         print_info(f"Run: {run_name}")
         print_info(f"Dry Run: {self.dry_run}")
         
-        # Step 1: Compile
-        if not self.compile_pipeline():
-            return False
-        
-        # Step 2: Connect to KFP
-        if not self.connect_to_kfp():
-            return False
-        
-        # Step 3: Upload pipeline
-        pipeline_id = self.upload_pipeline(pipeline_name)
-        if not pipeline_id:
-            return False
+        self.service_urls = tuple(
+            url for url in (
+                pipeline_params.get("gateway_url"),
+                pipeline_params.get("mlflow_tracking_uri"),
+            ) if url
+        )
         
-        # Step 4: Create experiment
-        experiment_id = self.create_experiment(experiment_name)
-        if not experiment_id:
+        # Steps 1-4: compile, connect, upload, experiment
+        pipeline_id, experiment_id = asyncio.run(
+            self._prepare_async(pipeline_name, experiment_name)
+        )
+        if not (pipeline_id and experiment_id):
+            self.print_failures()
             return False
         
         # Step 5: Create and start run
         run_id = self.create_run(experiment_id, run_name, pipeline_params)
         if not run_id:
+            self.print_failures()
             return False
         
         # Success summary
         print_header("Submission Complete")
         print_success("Pipeline submitted successfully")
-        print()
-        print(f"{Color.BOLD}Run Details:{Color.END}")
-        print(f"  Pipeline ID:   {pipeline_id}")
-        print(f"  Experiment ID: {experiment_id}")
-        print(f"  Run ID:        {run_id}")
-        print()
+        _emit("")
+        _emit(f"{Color.BOLD}Run Details:{Color.END}")
+        _emit(f"  Pipeline ID:   {pipeline_id}")
+        _emit(f"  Experiment ID: {experiment_id}")
+        _emit(f"  Run ID:        {run_id}")
+        _emit("")
         
         if not self.dry_run:
-            print(f"{Color.BOLD}Next Steps:{Color.END}")
-            print(f"  1. Monitor run in KFP UI")
-            print(f"  2. Check pod logs: kubectl logs -n {self.namespace} <pod-name>")
-            print(f"  3. Validate artifacts in MinIO")
-            print(f"  4. Verify MLflow tracking")
+            _emit(f"{Color.BOLD}Next Steps:{Color.END}")
+            _emit(f"  1. Monitor run in KFP UI")
+            _emit(f"  2. Check pod logs: kubectl logs -n {self.namespace} <pod-name>")
+            _emit(f"  3. Validate artifacts in MinIO")
+            _emit(f"  4. Verify MLflow tracking")
         
         return True
 
@@ -402,6 +640,9 @@ Examples:
   # Dry run (validate without executing)
   python submit_run_v2.py --dry-run
   
+  # Force every step to re-execute
+  python submit_run_v2.py --no-caching
+  
   # Custom KFP host (port-forwarded)
   python submit_run_v2.py --host http://localhost:8080
         """,
@@ -463,6 +704,12 @@ Examples:
         action="store_true",
         help="Skip compilation (use existing pipeline spec)",
     )
+    parser.add_argument(
+        "--no-compile-cache",
+        dest="use_compile_cache",
+        action="store_false",
+        help="Recompile even if the pipeline source is unchanged",
+    )
     parser.add_argument(
         "--pipeline-spec",
         type=Path,
@@ -476,26 +723,49 @@ Examples:
         action="store_true",
         help="Compile and validate only (don't submit to KFP)",
     )
+    parser.add_argument(
+        "--enable-caching",
+        dest="enable_caching",
+        action="store_true",
+        default=True,
+        help="Reuse cached step results when inputs are unchanged (default)",
+    )
+    parser.add_argument(
+        "--no-caching",
+        dest="enable_caching",
+        action="store_false",
+        help="Re-execute every step, ignoring cached results",
+    )
+    parser.add_argument(
+        "--cache-window-hours",
+        type=int,
+        default=0,
+        help="Maximum age of reused step results in hours, 0 for no limit (default: 0)",
+    )
+    parser.add_argument(
+        "--force-reprocess",
+        type=int,
+        help="Explicit force_reprocess value; overrides --cache-window-hours",
+    )
     
     args = parser.parse_args()
     
-    # Load runtime configuration
-    config = RuntimeConfig()
+    # Load runtime configuration (shared instance, built once per process)
+    config = get_config()
     
-    # Build pipeline parameters
+    # Build pipeline parameters: fixed defaults plus the CLI-controlled keys
     pipeline_params = {
+        **_DEFAULT_PARAMS,
         "dataset_name": args.dataset,
         "identifier": args.identifier,
         "gateway_url": args.gateway_url or config.gateway_url,
         "mlflow_tracking_uri": args.mlflow_uri or config.mlflow_tracking_uri,
-        # Add more parameters as needed
-        "hidden_size": 64,
-        "num_layers": 2,
-        "dropout": 0.2,
-        "learning_rate": 0.001,
-        "batch_size": 32,
-        "num_epochs": 50,
     }
+    if args.force_reprocess is not None:
+        pipeline_params["force_reprocess"] = args.force_reprocess
+    elif args.cache_window_hours > 0:
+        # Same value for every run in the window, so they share cache entries
+        pipeline_params["force_reprocess"] = int(time.time() // (args.cache_window_hours * 3600))
     
     # Create submitter
     submitter = KFPSubmitter(
@@ -504,6 +774,8 @@ Examples:
         skip_compile=args.skip_compile,
         pipeline_spec_path=args.pipeline_spec,
         dry_run=args.dry_run,
+        enable_caching=args.enable_caching,
+        use_compile_cache=args.use_compile_cache,
     )
     
     # Submit pipeline
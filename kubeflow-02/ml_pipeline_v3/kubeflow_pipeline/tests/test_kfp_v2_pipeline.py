@@ -18,20 +18,22 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from kfp import compiler, dsl
 from kubeflow_pipeline.components_v2 import (
-    preprocess_component,
+    preprocess_train_component,
+    preprocess_test_component,
     train_gru_component,
     train_lstm_component,
     train_prophet_component,
     eval_component,
     inference_component,
 )
-from kubeflow_pipeline.pipeline_v2 import flts_pipeline
+from kubeflow_pipeline.pipeline_v2 import flts_pipeline, get_precompiled_spec
 
 
 def test_components_are_valid():
     """Verify all components are KFP v2 components."""
     components = {
-        'preprocess_component': preprocess_component,
+        'preprocess_train_component': preprocess_train_component,
+        'preprocess_test_component': preprocess_test_component,
         'train_gru_component': train_gru_component,
         'train_lstm_component': train_lstm_component,
         'train_prophet_component': train_prophet_component,
@@ -39,12 +41,14 @@ def test_components_are_valid():
         'inference_component': inference_component,
     }
 
-    for name, comp in components.items():
-        # KFP v2 components have component_spec attribute
-        assert hasattr(comp, 'component_spec'), f"{name} missing component_spec"
-        # component_spec should have implementation and be non-None
-        assert comp.component_spec is not None, f"{name} has None component_spec"
-        print(f"  ✓ {name}: Valid KFP v2 component")
+    # KFP v2 components carry a non-None component_spec; check them all and
+    # report every offender at once
+    invalid = [
+        name for name, comp in components.items()
+        if getattr(comp, 'component_spec', None) is None
+    ]
+    assert not invalid, f"Missing or None component_spec: {invalid}"
+    sys.stdout.write("".join(f"  ✓ {name}: Valid KFP v2 component\n" for name in components))
 
     return True
 
@@ -89,6 +93,38 @@ def test_pipeline_compilation():
     return True
 
 
+def test_training_tasks_run_in_parallel():
+    """Test that the three trainers only wait on preprocess, not on each other."""
+    print("\nTest 4: Parallel Training")
+    print("-" * 50)
+    
+    tasks = json.loads(get_precompiled_spec())['root']['dag']['tasks']
+    
+    for name in ('train-gru-component', 'train-lstm-component', 'train-prophet-component'):
+        deps = tasks[name].get('dependentTasks', [])
+        assert deps == ['preprocess-train-component'], f"{name} depends on {deps}"
+        print(f"  ✓ {name}: depends only on preprocess-train-component")
+    
+    return True
+
+
+def test_preprocess_tasks_publish_one_split():
+    """Test that each preprocess task tells the container which split to publish."""
+    print("\nTest 5: Preprocess Splits")
+    print("-" * 50)
+    
+    spec = json.loads(get_precompiled_spec())
+    executors = spec['deploymentSpec']['executors']
+    
+    for component, split in (('preprocess-train-component', 'train'),
+                             ('preprocess-test-component', 'test')):
+        env = executors[f'exec-{component}']['container'].get('env', [])
+        assert {'name': 'PREPROCESS_SPLITS', 'value': split} in env, f"{component} env: {env}"
+        print(f"  ✓ {component}: PREPROCESS_SPLITS={split}")
+    
+    return True
+
+
 def run_all_tests():
     """Run all Step 8 tests."""
     print("=" * 70)
@@ -99,6 +135,8 @@ def run_all_tests():
         test_components_are_valid,
         test_pipeline_is_decorated,
         test_pipeline_compilation,
+        test_training_tasks_run_in_parallel,
+        test_preprocess_tasks_publish_one_split,
     ]
     
     passed = 0
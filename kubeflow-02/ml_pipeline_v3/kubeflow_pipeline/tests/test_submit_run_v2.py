@@ -0,0 +1,89 @@
+"""
+KFP v2 Submission Tests
+
+Checks how KFPSubmitter.create_run starts a run against a stand-in client,
+so no KFP API server is needed.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from kubeflow_pipeline.submit_run_v2 import KFPSubmitter
+
+
+class RecordingClient:
+    """Records which kfp Client run method was called, and with what."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def run_pipeline(self, **kwargs):
+        self.calls.append(("run_pipeline", kwargs))
+        return SimpleNamespace(run_id="run-from-version")
+    
+    def create_run_from_pipeline_package(self, **kwargs):
+        self.calls.append(("create_run_from_pipeline_package", kwargs))
+        return SimpleNamespace(run_id="run-from-package")
+
+
+def _submitter(enable_caching: bool) -> KFPSubmitter:
+    submitter = KFPSubmitter(
+        kfp_host="http://kfp.invalid",
+        pipeline_spec_path=Path("artifacts/flts_pipeline_v2.json"),
+        enable_caching=enable_caching,
+    )
+    submitter.client = RecordingClient()
+    submitter.pipeline_id = "pipeline-id"
+    submitter.pipeline_version_id = "version-id"
+    return submitter
+
+
+def test_uploaded_version_is_run_by_reference():
+    """With caching on, the uploaded version runs without resending the spec."""
+    submitter = _submitter(enable_caching=True)
+    
+    assert submitter.create_run("experiment-id", "run", {}) == "run-from-version"
+    (method, kwargs), = submitter.client.calls
+    assert method == "run_pipeline"
+    assert kwargs["version_id"] == "version-id"
+
+
+def test_no_caching_submits_package():
+    """--no-caching must go through the package, where kfp applies the override."""
+    submitter = _submitter(enable_caching=False)
+    
+    assert submitter.create_run("experiment-id", "run", {}) == "run-from-package"
+    (method, kwargs), = submitter.client.calls
+    assert method == "create_run_from_pipeline_package"
+    assert kwargs["enable_caching"] is False
+
+
+def test_package_fallback_keeps_task_caching():
+    """Without an uploaded version, caching on must not override per-task options."""
+    submitter = _submitter(enable_caching=True)
+    submitter.pipeline_version_id = None
+    
+    assert submitter.create_run("experiment-id", "run", {}) == "run-from-package"
+    (method, kwargs), = submitter.client.calls
+    assert method == "create_run_from_pipeline_package"
+    assert kwargs["enable_caching"] is None
+
+
+def test_find_pipeline_falls_back_when_status_is_missing():
+    """An ApiException without an HTTP status falls back to the scan."""
+    from kfp_server_api.exceptions import ApiException
+    
+    class FilterlessClient:
+        def list_pipelines(self, filter=None, page_size=10):
+            if filter is not None:
+                raise ApiException(reason="predicate rejected")
+            return SimpleNamespace(pipelines=[SimpleNamespace(display_name="flts")])
+    
+    submitter = _submitter(enable_caching=True)
+    submitter.client = FilterlessClient()
+    
+    assert submitter._find_pipeline("flts").display_name == "flts"
@@ -16,7 +16,7 @@ CSV Export: If you also want CSVs, launch Locust with `--csv /mnt/locust/results
 """
 
 from locust import HttpUser, task, between, events
-import os, json, time, threading, uuid, random, datetime as dt
+import os, json, time, threading, uuid, random, queue, datetime as dt
 import posixpath
 from urllib.parse import urlsplit
 
@@ -363,6 +363,8 @@ def on_test_start(environment, **kw):  # noqa: D401
     # Mark predict as ready globally
     globals()["_predict_ready"] = True
     
+    _start_log_writer()
+    
     # Resolve sequence lengths from environment or use defaults
     in_len = int(os.getenv("PREDICT_INPUT_LEN", "10"))
     out_len = int(os.getenv("PREDICT_OUTPUT_LEN", "1"))
@@ -377,7 +379,15 @@ def on_test_start(environment, **kw):  # noqa: D401
         "caching_disabled": True,
     })
 
-_log_file_lock = threading.Lock()
+# JSONL records are handed to one background writer thread that keeps the
+# log open and writes them in batches, so the request hook never touches
+# the disk or serialises users on a file lock
+_log_queue: "queue.Queue" = queue.Queue(maxsize=10000)
+_LOG_STOP = object()  # sentinel: flush and close the log
+_LOG_BATCH = 256
+_log_writer: threading.Thread | None = None
+_log_writer_lock = threading.Lock()
+_log_disabled = False  # latched when LOG_FILE cannot be opened
 
 # --- Session / run identification ---
 # A unique run identifier to delineate test sessions in the JSONL log.
@@ -386,16 +396,89 @@ _session_header_written = False
 
 # No discovery – assume inference service already promoted & loaded.
 
+def _log_writer_loop(fh):
+    """Drain the log queue into fh, writing up to _LOG_BATCH lines per write()."""
+    with fh:
+        stop = False
+        while not stop:
+            lines = []
+            item = _log_queue.get()
+            while True:
+                if item is _LOG_STOP:
+                    stop = True
+                    break
+                lines.append(item)
+                if len(lines) == _LOG_BATCH:
+                    break
+                try:
+                    item = _log_queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                if lines:
+                    fh.write("\n".join(lines) + "\n")
+                # Flush whenever the queue runs dry so the file stays current
+                if stop or _log_queue.empty():
+                    fh.flush()
+            except Exception as e:
+                print(f"[locustfile] Failed writing log records: {e}")
+
+
+def _start_log_writer():
+    """Start the log writer thread if it is not already running.
+    
+    The file is opened here, not in the thread, so that a failure is seen
+    once and disables logging instead of being retried on every record.
+    """
+    global _log_writer, _log_disabled
+    with _log_writer_lock:
+        if _log_disabled or (_log_writer is not None and _log_writer.is_alive()):
+            return
+        try:
+            fh = open(LOG_FILE, "a", encoding="utf-8", buffering=1 << 20)
+        except Exception as e:
+            _log_disabled = True
+            print(f"[locustfile] Failed opening log file, JSONL logging disabled: {e}")
+            return
+        _log_writer = threading.Thread(target=_log_writer_loop, args=(fh,), name="jsonl-writer", daemon=True)
+        _log_writer.start()
+
+
+def _stop_log_writer(timeout: float = 5.0):
+    """Flush queued records and stop the writer thread."""
+    with _log_writer_lock:
+        writer = _log_writer
+        if writer is None or not writer.is_alive():
+            return
+        _log_queue.put(_LOG_STOP)
+    writer.join(timeout)
+
+
 def _append_jsonl(record: dict):
-    """Thread-safe append of a single JSON record to the log file."""
+    """Queue a single JSON record for the log writer thread."""
+    if _log_disabled:
+        return
     try:
         line = json.dumps(record, separators=(",", ":"))
-        with _log_file_lock:
-            with open(LOG_FILE, "a", encoding="utf-8") as fh:
-                fh.write(line + "\n")
     except Exception as e:
         # Avoid throwing inside hook; just print.
         print(f"[locustfile] Failed logging record: {e}")
+        return
+    if _log_writer is None or not _log_writer.is_alive():
+        _start_log_writer()
+        if _log_disabled:
+            return
+    try:
+        _log_queue.put_nowait(line)
+    except queue.Full:
+        # The writer is behind; dropping a record beats stalling the hook
+        pass
+
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **kw):  # noqa: D401
+    """Flush the JSONL log when the test stops."""
+    _stop_log_writer()
 
 
 @events.request.add_listener
@@ -17,6 +17,7 @@ import json
 import os
 import time
 import hashlib
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, Tuple, Optional
 
@@ -91,32 +92,128 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
-def build_active_config() -> Dict[str, Any]:
+@dataclass(frozen=True)
+class PreprocessConfig:
+    """Typed inputs for :func:`run_preprocess`.
+
+    In-process callers (e.g. the KFP component) construct this directly so
+    parameters keep their types; the standalone container builds it from
+    environment variables via :meth:`from_env`.
+    """
+
+    identifier: str = ""
+    dataset_name: Optional[str] = None  # derives train/test file names unless overridden
+    train_file: Optional[str] = None
+    test_file: Optional[str] = None
+    gateway_url: str = "http://fastapi-app:8000"
+    input_bucket: str = "dataset"
+    output_bucket: str = "processed-data"
+    output_train: str = "processed_data"
+    output_test: str = "test_processed_data"
+    topic_train: str = "training-data"
+    topic_infer: str = "inference-data"
+    use_kfp: bool = False  # write KFP artifacts instead of Kafka messages
+    splits: str = "both"  # both | train | test - which outputs to publish
+    # Subsetting / sampling controls
+    sample_train_rows: int = 0
+    sample_test_rows: int = 0
+    sample_strategy: str = "head"  # head | random
+    sample_seed: int = 42
+    # Transformation recipe (hashed into config_hash)
+    handle_nans: bool = DEFAULTS["HANDLE_NANS"]
+    nans_threshold: float = DEFAULTS["NANS_THRESHOLD"]
+    nans_knn: int = DEFAULTS["NANS_KNN"]
+    nans_drop_rows: bool = DEFAULTS["NANS_DROP_ROWS"]
+    clip_enable: bool = DEFAULTS["CLIP_ENABLE"]
+    clip_method: str = DEFAULTS["CLIP_METHOD"]
+    clip_factor: float = DEFAULTS["CLIP_FACTOR"]
+    time_features_enable: bool = DEFAULTS["TIME_FEATURES_ENABLE"]
+    lags_enable: bool = DEFAULTS["LAGS_ENABLE"]
+    lags_n: int = DEFAULTS["LAGS_N"]
+    lags_step: int = DEFAULTS["LAGS_STEP"]
+    scaler: str = DEFAULTS["SCALER"]
+    add_val: Optional[str] = DEFAULTS["ADD_VAL"]
+    extra_hash_salt: str = ""
+    # Shared cache volume for raw input downloads (empty or unmounted disables;
+    # unset on the v2 pipeline, see _get_input)
+    cache_dir: str = ""
+    # KFP output locations
+    kfp_training_data_output_path: str = "/tmp/outputs/training_data/data"
+    kfp_inference_data_output_path: str = "/tmp/outputs/inference_data/data"
+    kfp_config_hash_output_path: str = "/tmp/outputs/config_hash/data"
+    kfp_config_json_output_path: str = "/tmp/outputs/config_json/data"
+
+    @classmethod
+    def from_env(cls) -> "PreprocessConfig":
+        env = os.environ.get
+        return cls(
+            identifier=env("IDENTIFIER", ""),
+            dataset_name=env("DATASET_NAME"),
+            train_file=env("TRAIN_FILE"),
+            test_file=env("TEST_FILE"),
+            gateway_url=env("GATEWAY_URL", "http://fastapi-app:8000"),
+            input_bucket=env("INPUT_BUCKET", "dataset"),
+            output_bucket=env("OUTPUT_BUCKET", "processed-data"),
+            output_train=env("OUTPUT_TRAIN", "processed_data"),
+            output_test=env("OUTPUT_TEST", "test_processed_data"),
+            topic_train=env("PRODUCER_TOPIC_0", "training-data"),
+            topic_infer=env("PRODUCER_TOPIC_1", "inference-data"),
+            use_kfp=bool(int(env("USE_KFP", "0"))),
+            splits=env("PREPROCESS_SPLITS", "both").lower(),
+            sample_train_rows=int(env("SAMPLE_TRAIN_ROWS", "0") or 0),
+            sample_test_rows=int(env("SAMPLE_TEST_ROWS", "0") or 0),
+            sample_strategy=env("SAMPLE_STRATEGY", "head"),
+            sample_seed=int(env("SAMPLE_SEED", "42") or 42),
+            handle_nans=_env_bool("HANDLE_NANS", DEFAULTS["HANDLE_NANS"]),
+            nans_threshold=_env_float("NANS_THRESHOLD", DEFAULTS["NANS_THRESHOLD"]),
+            nans_knn=_env_int("NANS_KNN", DEFAULTS["NANS_KNN"]),
+            nans_drop_rows=_env_bool("NANS_DROP_ROWS", DEFAULTS["NANS_DROP_ROWS"]),
+            clip_enable=_env_bool("CLIP_ENABLE", DEFAULTS["CLIP_ENABLE"]),
+            clip_method=env("CLIP_METHOD", DEFAULTS["CLIP_METHOD"]),
+            clip_factor=_env_float("CLIP_FACTOR", DEFAULTS["CLIP_FACTOR"]),
+            time_features_enable=_env_bool("TIME_FEATURES_ENABLE", DEFAULTS["TIME_FEATURES_ENABLE"]),
+            lags_enable=_env_bool("LAGS_ENABLE", DEFAULTS["LAGS_ENABLE"]),
+            lags_n=_env_int("LAGS_N", DEFAULTS["LAGS_N"]),
+            lags_step=_env_int("LAGS_STEP", DEFAULTS["LAGS_STEP"]),
+            scaler=env("SCALER", DEFAULTS["SCALER"]),
+            add_val=env("ADD_VAL", DEFAULTS["ADD_VAL"]),
+            extra_hash_salt=env("EXTRA_HASH_SALT", ""),
+            cache_dir=env("FLTS_CACHE_DIR", ""),
+            kfp_training_data_output_path=env("KFP_TRAINING_DATA_OUTPUT_PATH", "/tmp/outputs/training_data/data"),
+            kfp_inference_data_output_path=env("KFP_INFERENCE_DATA_OUTPUT_PATH", "/tmp/outputs/inference_data/data"),
+            kfp_config_hash_output_path=env("KFP_CONFIG_HASH_OUTPUT_PATH", "/tmp/outputs/config_hash/data"),
+            kfp_config_json_output_path=env("KFP_CONFIG_JSON_OUTPUT_PATH", "/tmp/outputs/config_json/data"),
+        )
+
+
+def build_active_config(config: Optional[PreprocessConfig] = None) -> Dict[str, Any]:
+    if config is None:
+        config = PreprocessConfig.from_env()
     cfg = {
         "handle_nans": {
-            "enabled": _env_bool("HANDLE_NANS", DEFAULTS["HANDLE_NANS"]),
-            "threshold": _env_float("NANS_THRESHOLD", DEFAULTS["NANS_THRESHOLD"]),
-            "knn_neighbors": _env_int("NANS_KNN", DEFAULTS["NANS_KNN"]),
-            "drop_rows": _env_bool("NANS_DROP_ROWS", DEFAULTS["NANS_DROP_ROWS"]),
+            "enabled": config.handle_nans,
+            "threshold": config.nans_threshold,
+            "knn_neighbors": config.nans_knn,
+            "drop_rows": config.nans_drop_rows,
         },
         "outliers": {
-            "enabled": _env_bool("CLIP_ENABLE", DEFAULTS["CLIP_ENABLE"]),
-            "method": os.environ.get("CLIP_METHOD", DEFAULTS["CLIP_METHOD"]).lower(),
-            "factor": _env_float("CLIP_FACTOR", DEFAULTS["CLIP_FACTOR"]),
+            "enabled": config.clip_enable,
+            "method": config.clip_method.lower(),
+            "factor": config.clip_factor,
         },
-        "time_features": {"enabled": _env_bool("TIME_FEATURES_ENABLE", DEFAULTS["TIME_FEATURES_ENABLE"])},
+        "time_features": {"enabled": config.time_features_enable},
         "lags": {
-            "enabled": _env_bool("LAGS_ENABLE", DEFAULTS["LAGS_ENABLE"]),
-            "n_lags": _env_int("LAGS_N", DEFAULTS["LAGS_N"]),
-            "step": _env_int("LAGS_STEP", DEFAULTS["LAGS_STEP"]),
+            "enabled": config.lags_enable,
+            "n_lags": config.lags_n,
+            "step": config.lags_step,
         },
         "scaling": {
-            "method": os.environ.get("SCALER", DEFAULTS["SCALER"]).strip(),
-            "add_constant": os.environ.get("ADD_VAL", DEFAULTS["ADD_VAL"]),
+            "method": config.scaler.strip(),
+            "add_constant": config.add_val,
         },
         # Salt allows forcing a new hash without altering actual transformations; tracked for lineage.
         "extra": {
-            "hash_salt": os.environ.get("EXTRA_HASH_SALT", "")
+            "hash_salt": config.extra_hash_salt
         }
     }
     return cfg
@@ -202,6 +299,38 @@ def _get_with_retry(gateway: str, bucket: str, obj: str):
     return get_file(gateway, bucket, obj)
 
 
+def _get_input(gateway: str, bucket: str, obj: str, cache_dir: str):
+    """Fetch a raw input file, reusing the shared cache volume when mounted.
+
+    Files are cached as ``<cache_dir>/datasets/<bucket>/<obj>``; delete that
+    directory after replacing a dataset in MinIO.
+
+    Only the deprecated v1 pipeline (which mounts flts-model-cache and sets
+    FLTS_CACHE_DIR) and manual runs with FLTS_CACHE_DIR set benefit. The v2
+    pipeline mounts no volume and does not set it, so there every input is
+    downloaded through the gateway.
+    """
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return _get_with_retry(gateway, bucket, obj)
+    path = os.path.join(cache_dir, "datasets", bucket, obj)
+    if os.path.exists(path):
+        _log("input_cache_hit", bucket=bucket, object=obj)
+        with open(path, "rb") as f:
+            return io.BytesIO(f.read())
+    stream = _get_with_retry(gateway, bucket, obj)
+    if stream is not None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(stream.getbuffer())
+            # Concurrent runs share the volume; publish the file atomically
+            os.replace(tmp_path, path)
+        except OSError as e:  # best effort: a read-only or full volume just means no caching
+            _log("input_cache_write_fail", bucket=bucket, object=obj, error=str(e))
+    return stream
+
+
 def _read_meta_if_exists(gateway: str, bucket: str, meta_obj: str) -> Optional[Dict[str, Any]]:
     try:
         b = _get_with_retry(gateway, bucket, meta_obj)
@@ -225,17 +354,17 @@ def _log(event: str, **extra):
     print(json.dumps(base))
 
 
-def _write_kfp_artifacts(train_meta: Dict[str, Any], test_meta: Dict[str, Any], config_hash: str, canonical: str) -> None:
+def _write_kfp_artifacts(config: PreprocessConfig, train_meta: Optional[Dict[str, Any]], test_meta: Optional[Dict[str, Any]], config_hash: str, canonical: str) -> None:
     """Write KFP artifact metadata to standard output paths.
     
     KFP will read these files to populate Output[Dataset] and Output[Artifact] objects.
+    A split whose meta is None was not published and gets no dataset artifact.
     """
-    # Determine output bucket from environment or metadata
-    out_bucket = os.environ.get("OUTPUT_BUCKET", "processed-data")
+    out_bucket = config.output_bucket
     
     # Training dataset artifact metadata
-    kfp_training_output = os.environ.get("KFP_TRAINING_DATA_OUTPUT_PATH", "/tmp/outputs/training_data/data")
-    if kfp_training_output:
+    kfp_training_output = config.kfp_training_data_output_path
+    if kfp_training_output and train_meta is not None:
         os.makedirs(os.path.dirname(kfp_training_output), exist_ok=True)
         with open(kfp_training_output, 'w') as f:
             json.dump({
@@ -244,8 +373,8 @@ def _write_kfp_artifacts(train_meta: Dict[str, Any], test_meta: Dict[str, Any],
             }, f, separators=(',', ':'))
     
     # Inference dataset artifact metadata
-    kfp_inference_output = os.environ.get("KFP_INFERENCE_DATA_OUTPUT_PATH", "/tmp/outputs/inference_data/data")
-    if kfp_inference_output:
+    kfp_inference_output = config.kfp_inference_data_output_path
+    if kfp_inference_output and test_meta is not None:
         os.makedirs(os.path.dirname(kfp_inference_output), exist_ok=True)
         with open(kfp_inference_output, 'w') as f:
             json.dump({
@@ -254,14 +383,14 @@ def _write_kfp_artifacts(train_meta: Dict[str, Any], test_meta: Dict[str, Any],
             }, f, separators=(',', ':'))
     
     # Config hash output (string parameter)
-    kfp_config_hash_output = os.environ.get("KFP_CONFIG_HASH_OUTPUT_PATH", "/tmp/outputs/config_hash/data")
+    kfp_config_hash_output = config.kfp_config_hash_output_path
     if kfp_config_hash_output:
         os.makedirs(os.path.dirname(kfp_config_hash_output), exist_ok=True)
         with open(kfp_config_hash_output, 'w') as f:
             f.write(config_hash)
     
     # Config JSON output (string parameter)
-    kfp_config_json_output = os.environ.get("KFP_CONFIG_JSON_OUTPUT_PATH", "/tmp/outputs/config_json/data")
+    kfp_config_json_output = config.kfp_config_json_output_path
     if kfp_config_json_output:
         os.makedirs(os.path.dirname(kfp_config_json_output), exist_ok=True)
         with open(kfp_config_json_output, 'w') as f:
@@ -291,39 +420,51 @@ def readyz():
         return JSONResponse(status_code=503, content={"status": "error", "detail": str(e)})
 
 
-def run_preprocess() -> None:
+def run_preprocess(config: Optional[PreprocessConfig] = None) -> None:
+    """Run one preprocessing pass.
+
+    ``config`` is normally passed by in-process callers; when omitted the
+    settings are read from environment variables (standalone container use).
+    """
     start = time.time()
-    identifier = os.environ.get("IDENTIFIER", "")
-    gateway = os.environ.get("GATEWAY_URL", "http://fastapi-app:8000")
-    topic_train = os.environ.get("PRODUCER_TOPIC_0", "training-data")
-    topic_infer = os.environ.get("PRODUCER_TOPIC_1", "inference-data")
+    if config is None:
+        config = PreprocessConfig.from_env()
+    identifier = config.identifier
+    gateway = config.gateway_url
+    topic_train = config.topic_train
+    topic_infer = config.topic_infer
     
     # KFP mode flag - if enabled, write artifacts instead of Kafka messages
-    USE_KFP = int(os.environ.get("USE_KFP", "0"))
-    input_bucket = os.environ.get("INPUT_BUCKET", "dataset")
+    USE_KFP = config.use_kfp
+    input_bucket = config.input_bucket
 
     # --- Dynamic dataset selection ---
-    dataset_name = os.environ.get("DATASET_NAME")  # if provided, derive train/test names unless explicitly overridden
-    train_file_env = os.environ.get("TRAIN_FILE")
-    test_file_env = os.environ.get("TEST_FILE")
+    dataset_name = config.dataset_name  # if provided, derive train/test names unless explicitly overridden
     if dataset_name:
-        train_file = train_file_env or f"{dataset_name}.csv"
-        test_file = test_file_env or f"{dataset_name}_test.csv"
+        train_file = config.train_file or f"{dataset_name}.csv"
+        test_file = config.test_file or f"{dataset_name}_test.csv"
     else:
-        train_file = train_file_env or "PobleSec.csv"
-        test_file = test_file_env or "PobleSec_test.csv"
+        train_file = config.train_file or "PobleSec.csv"
+        test_file = config.test_file or "PobleSec_test.csv"
 
-    out_bucket = os.environ.get("OUTPUT_BUCKET", "processed-data")
-    out_train_base = os.environ.get("OUTPUT_TRAIN", "processed_data")
-    out_test_base = os.environ.get("OUTPUT_TEST", "test_processed_data")
+    out_bucket = config.output_bucket
+    out_train_base = config.output_train
+    out_test_base = config.output_test
 
     # --- Subsetting / sampling controls ---
-    sample_train_rows = int(os.environ.get("SAMPLE_TRAIN_ROWS", "0") or 0)
-    sample_test_rows = int(os.environ.get("SAMPLE_TEST_ROWS", "0") or 0)
-    sample_strategy = os.environ.get("SAMPLE_STRATEGY", "head").lower()  # head | random
-    sample_seed = int(os.environ.get("SAMPLE_SEED", "42") or 42)
-
-    active_cfg = build_active_config()
+    sample_train_rows = config.sample_train_rows
+    sample_test_rows = config.sample_test_rows
+    sample_strategy = config.sample_strategy.lower()  # head | random
+    sample_seed = config.sample_seed
+
+    # The split tasks of the KFP pipeline each publish one side; both are
+    # still processed because the test split is scaled with the train fit
+    if config.splits not in ("both", "train", "test"):
+        raise ValueError(f"PREPROCESS_SPLITS must be both, train or test, got {config.splits!r}")
+    publish_train = config.splits in ("both", "train")
+    publish_test = config.splits in ("both", "test")
+
+    active_cfg = build_active_config(config)
     # Embed data & sampling parameters into config for lineage only (no hashing)
     active_cfg["_data"] = {
         "train_file": train_file,
@@ -351,8 +492,8 @@ def run_preprocess() -> None:
 
     try:
         _log("download_start", identifier=identifier, train_file=train_file, test_file=test_file)
-        df_train = read_data(_get_with_retry(gateway, input_bucket, train_file))
-        df_test = read_data(_get_with_retry(gateway, input_bucket, test_file))
+        df_train = read_data(_get_input(gateway, input_bucket, train_file, config.cache_dir))
+        df_test = read_data(_get_input(gateway, input_bucket, test_file, config.cache_dir))
         orig_train_rows, orig_test_rows = len(df_train), len(df_test)
 
         # Apply sampling for faster iterations if requested
@@ -385,12 +526,14 @@ def run_preprocess() -> None:
 
         # Parquet metadata embed (config and hash for lifecycle tracking)
         meta_embed = {"preprocess_config": canonical, "config_hash": config_hash}
-        train_bytes = to_parquet_bytes(proc_train, meta_embed)
-        test_bytes = to_parquet_bytes(proc_test, meta_embed)
-
-        _log("upload_start", identifier=identifier, object_key=train_obj)
-        _post_with_retry(gateway, out_bucket, train_obj, train_bytes)
-        _post_with_retry(gateway, out_bucket, test_obj, test_bytes)
+        train_bytes = to_parquet_bytes(proc_train, meta_embed) if publish_train else b""
+        test_bytes = to_parquet_bytes(proc_test, meta_embed) if publish_test else b""
+
+        _log("upload_start", identifier=identifier, object_key=train_obj, splits=config.splits)
+        if publish_train:
+            _post_with_retry(gateway, out_bucket, train_obj, train_bytes)
+        if publish_test:
+            _post_with_retry(gateway, out_bucket, test_obj, test_bytes)
         _log("upload_done", identifier=identifier, object_key=train_obj, size_train=len(train_bytes), size_test=len(test_bytes))
 
         created_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -416,33 +559,38 @@ def run_preprocess() -> None:
             "row_count": len(proc_test),
             "column_names": proc_test.columns.tolist(),
         }
-        _write_meta(gateway, out_bucket, train_meta_obj, train_meta)
-        _write_meta(gateway, out_bucket, test_meta_obj, test_meta)
+        if publish_train:
+            _write_meta(gateway, out_bucket, train_meta_obj, train_meta)
+        if publish_test:
+            _write_meta(gateway, out_bucket, test_meta_obj, test_meta)
 
         # Publish results: Kafka mode vs KFP artifact mode
         if USE_KFP:
             # KFP mode: Write artifact metadata to files
             _write_kfp_artifacts(
-                train_meta=train_meta,
-                test_meta=test_meta,
+                config,
+                train_meta=train_meta if publish_train else None,
+                test_meta=test_meta if publish_test else None,
                 config_hash=config_hash,
                 canonical=canonical
             )
             _log("kfp_artifacts_written", identifier=identifier, config_hash=config_hash)
         elif producer:
             # Kafka mode: Publish claim checks to topics
-            produce_message(
-                producer,
-                topic_train,
-                {"bucket": out_bucket, "object": train_obj, "size": len(train_bytes), "v": 1, "identifier": identifier},
-                key="train-claim",
-            )
-            produce_message(
-                producer,
-                topic_infer,
-                {"bucket": out_bucket, "object": test_obj, "object_key": test_obj, "size": len(test_bytes), "operation": "post: test data", "v": 1, "identifier": identifier},
-                key="inference-claim",
-            )
+            if publish_train:
+                produce_message(
+                    producer,
+                    topic_train,
+                    {"bucket": out_bucket, "object": train_obj, "size": len(train_bytes), "v": 1, "identifier": identifier},
+                    key="train-claim",
+                )
+            if publish_test:
+                produce_message(
+                    producer,
+                    topic_infer,
+                    {"bucket": out_bucket, "object": test_obj, "object_key": test_obj, "size": len(test_bytes), "operation": "post: test data", "v": 1, "identifier": identifier},
+                    key="inference-claim",
+                )
 
         duration_ms = int((time.time() - start) * 1000)
         _log("success", identifier=identifier, object_key=train_obj, duration_ms=duration_ms, result="ok")
@@ -5,16 +5,49 @@ Version marker injected for runtime verification. Increment VERSION when patchin
 
 VERSION = "trainer_v20251002_03"
 
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from client_utils import get_file
+
+
+def _start_kfp_training_data_prefetch():
+    """Start downloading the KFP training parquet before the heavy imports below.
+
+    Importing torch/mlflow (and the bucket check) takes seconds, while the
+    download only needs the input artifact and GATEWAY_URL, so overlap them.
+    Returns a Future for the parquet bytes, or None when there is nothing to
+    prefetch; _process_kfp_training_data then validates and downloads as usual.
+    """
+    path = os.environ.get("KFP_TRAINING_DATA_INPUT_PATH")
+    gateway_url = os.environ.get("GATEWAY_URL")
+    if os.getenv("USE_KFP", "1") == "0" or not path or not gateway_url or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            uri = json.load(f).get("uri", "")
+    except (OSError, ValueError):
+        return None
+    if not uri.startswith("minio://"):
+        return None
+    bucket, _, object_key = uri[len("minio://"):].partition("/")
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kfp-prefetch")
+    future = executor.submit(get_file, gateway_url, bucket, object_key)
+    executor.shutdown(wait=False)
+    return future
+
+
+_KFP_TRAINING_DATA_PREFETCH = _start_kfp_training_data_prefetch()
+
 import numpy as np
 import pandas as pd
 import mlflow  # type: ignore
 import mlflow.pytorch  # type: ignore
 import pickle
 import tempfile
-import os
 import threading
 import queue
-import json
 import pyarrow.parquet as pq
 import torch
 import time
@@ -23,7 +56,6 @@ from typing import List, Dict, Any, Tuple, Set
 from ml_models import LSTM, GRU, TETS, TCN, EncoderLSTM
 from train import prepare_data_loaders, train
 from data_utils import window_data, subset_scaler
-from client_utils import get_file
 
 # Global config import
 import sys
@@ -167,8 +199,11 @@ def _process_kfp_training_data():
     _jlog("kfp_download_start", bucket=bucket, object_key=object_key)
     
     try:
-        # Download Parquet from MinIO
-        parquet_bytes = get_file(GATEWAY_URL, bucket, object_key)
+        # Download Parquet from MinIO (normally already in flight since startup)
+        if _KFP_TRAINING_DATA_PREFETCH is not None:
+            parquet_bytes = _KFP_TRAINING_DATA_PREFETCH.result()
+        else:
+            parquet_bytes = get_file(GATEWAY_URL, bucket, object_key)
         table = pq.read_table(source=parquet_bytes)
         df = table.to_pandas()
         schema = pq.read_schema(parquet_bytes)